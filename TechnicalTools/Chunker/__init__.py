@@ -1 +1,2 @@
 from . chunker import UpperLowerChunker
+from . streaming_chunker import StreamingUpperLowerChunker
@@ -1,6 +1,7 @@
+import numpy as np
 from typing import Optional, List
 
-from .. DataOrganizer import DataPoints, Chunk, Chunks
+from .. DataOrganizer import Candles, DataPoints, Chunks
 
 class UpperLowerChunker() :
     """
@@ -33,6 +34,10 @@ class UpperLowerChunker() :
         First, high and low datapoints is concatenated and sorted by x-order.
         Second, contiguous high or low datapoints will be grouped in a chunk.
         
+        If black_or_whites are passed, datapoints at the same x are ordered as
+        white upper and black lower first, then the others. Remaining ties keep upper before lower.
+        Sorting is a stable 'lexsort' on column arrays, and chunks are runs of symbol codes.
+        
         Args :
             upper_data            : upper 'DataPoints' object for '^'s of zigzag detection.
             lower_data            : lower 'DataPoints' object for 'v's of zigzag detection.
@@ -42,37 +47,78 @@ class UpperLowerChunker() :
         Returns : 'Chunks' objects.
         """
         
-        def gen_sortkey(p,bw) :
-            
-            symbol = p.symbol
-            x = p.x
-            if (symbol == self._upper_symbol and bw == 'white') \
-                or (symbol == self._lower_symbol and bw == 'black') :
-                order = 1
-            else :
-                order = 2
-            return (x,order)
+        if not isinstance(upper_data,DataPoints) :
+            upper_data = DataPoints(upper_data)
+        if not isinstance(lower_data,DataPoints) :
+            lower_data = DataPoints(lower_data)
         
         if upper_black_or_whites is None or lower_black_or_whites is None :
-            sorted_data_points = [ dp for dp in upper_data ] + [ dp for dp in lower_data ]
-            sorted_data_points.sort(key=lambda dp:dp.x)
+            return self._chunk_down(DataPoints.concatenate([ upper_data, lower_data ]))
         else :
-            tmp = \
-                [ (dp,bw) for dp,bw in zip(upper_data, upper_black_or_whites ) ] \
-                + [ (dp,bw) for dp,bw in zip(lower_data, lower_black_or_whites ) ]
-            
-            tmp.sort(key=lambda dp : gen_sortkey(*dp))
-            sorted_data_points = [ dp for (dp,bw) in tmp]
+            upper_black_or_whites = np.asarray(upper_black_or_whites)
+            lower_black_or_whites = np.asarray(lower_black_or_whites)
             
-        chunks = Chunks([])
-        symbol_old = None
-        for dp in sorted_data_points :
-             
-            if dp.symbol != symbol_old :
-                chunk = Chunk([],symbol=dp.symbol)
-                chunks.append(chunk)
-                symbol_old = dp.symbol
+            # datapoints without black_or_white are dropped, as zipped.
+            upper_data = upper_data[:len(upper_black_or_whites)]
+            lower_data = lower_data[:len(lower_black_or_whites)]
+            black_or_whites = np.concatenate((upper_black_or_whites[:len(upper_data)],
+                                              lower_black_or_whites[:len(lower_data)]))
             
-            chunk.append(dp)
+            merged = DataPoints.concatenate([ upper_data, lower_data ])
+            codes, table = merged._columns['symbol'], merged._symbol_table
+            is_upper = codes == ( table.index(self._upper_symbol) if self._upper_symbol in table else -2 )
+            is_lower = codes == ( table.index(self._lower_symbol) if self._lower_symbol in table else -2 )
             
-        return chunks
+            first = ( is_upper & ( black_or_whites == 'white' ) ) | ( is_lower & ( black_or_whites == 'black' ) )
+            return self._chunk_down(merged, first)
+
+
+    def _chunk_down(self,merged:DataPoints,first=None) :
+        """Sorts concatenated upper and lower datapoints by x (and 'first' mask at the same x),
+        and groups runs of the same symbol into chunks.
+        """
+
+        if first is None :
+            order = np.argsort(merged.xs, kind='stable')
+        else :
+            order = np.lexsort(( np.where(first, 1, 2), merged.xs ))
+
+        return Chunks.create_from_datapoints(merged[order])
+
+
+    def chunk_from_candles(self,
+                           candles:Candles,
+                           upper_sampler,
+                           lower_sampler,
+                           upper_ohlcv:str='H',
+                           lower_ohlcv:str='L') :
+        """Samples upper/lower datapoints from candles and chunks them down in one call.
+        Same as 'chunk_down' of sampled datapoints with black_or_whites of their candles,
+        but candle colors are gathered from 'Candles.is_whites' by sampled positions,
+        without creating intermediate 'Candle' or 'DataPoint' objects.
+        Datapoints have the chunker's upper/lower symbols.
+
+        Args :
+            candles : 'Candles' objects.
+            upper_sampler : sampler for upper datapoints. i.e. LocalMinMaxSampler('max'), ConvexSampler('upward').
+            lower_sampler : sampler for lower datapoints. i.e. LocalMinMaxSampler('min'), ConvexSampler('downward').
+            upper_ohlcv : ohlcv for upper datapoints. default='H'. (see 'DataPoints.create_from_candles')
+            lower_ohlcv : ohlcv for lower datapoints. default='L'.
+
+        Returns : 'Chunks' objects.
+        """
+
+        upper_data = DataPoints.create_from_candles(candles, upper_ohlcv, symbol=self._upper_symbol)
+        lower_data = DataPoints.create_from_candles(candles, lower_ohlcv, symbol=self._lower_symbol)
+
+        upper_positions = upper_sampler.sample_indices(upper_data)
+        lower_positions = lower_sampler.sample_indices(lower_data)
+
+        merged = DataPoints.concatenate([ upper_data[upper_positions], lower_data[lower_positions] ])
+        whites = candles.is_whites
+        first = np.concatenate(( whites[upper_positions], ~whites[lower_positions] ))
+
+        if self._upper_symbol == self._lower_symbol :
+            first = np.ones(len(merged), dtype=bool)
+
+        return self._chunk_down(merged, first)
@@ -0,0 +1,127 @@
+from bisect import bisect_right
+from typing import Optional
+
+from .. DataOrganizer import DataPoint, DataPoints, Chunk, Chunks
+from . chunker import UpperLowerChunker
+
+
+class StreamingUpperLowerChunker(UpperLowerChunker) :
+    """Incremental form of 'UpperLowerChunker.chunk_down'.
+    Sampled high/low datapoints are pushed as they are confirmed, and chunks are
+    the same as 'chunk_down' over all pushed datapoints.
+
+    Datapoints are kept sorted by (x, black/white order, upper before lower, push order).
+    A datapoint arriving in x-order extends the last chunk or opens a new one in O(1).
+    A late datapoint (i.e. lower point confirmed after an upper point with larger x)
+    is inserted and only the chunks from its position are regrouped.
+    """
+
+    def __init__(self,upper_symbol:str,lower_symbol:str) :
+        """Init.
+
+        Args :
+            upper_symbol : symbol for upper chunks.
+            lower_symbol : symbol for lower_chunks.
+        """
+        super().__init__(upper_symbol,lower_symbol)
+
+        self._keys = []
+        self._data = []
+        self._chunk_starts = []
+        self._count = 0
+
+
+    def __len__(self) :
+        return len(self._chunk_starts)
+
+
+    def _sortkey(self,dp,bw,side) :
+
+        if bw is None :
+            order = 0
+        elif ( dp.symbol == self._upper_symbol and bw == 'white' ) \
+            or ( dp.symbol == self._lower_symbol and bw == 'black' ) :
+            order = 1
+        else :
+            order = 2
+
+        self._count += 1
+        return ( dp.x, order, side, self._count )
+
+
+    def _regroup(self,first) :
+        """Regroups datapoints into chunks from chunk 'first'."""
+
+        start = self._chunk_starts[first]
+        self._chunk_starts[first:] = [ i for i in range(start,len(self._data))
+                                       if i == start or self._data[i].symbol != self._data[i-1].symbol ]
+
+
+    def _chunk_bounds(self,first) :
+        return list(zip(self._chunk_starts[first:], self._chunk_starts[first+1:] + [len(self._data)]))
+
+
+    def _push(self,dp,bw,side) :
+
+        if not isinstance(dp,DataPoint) :
+            raise Exception("variable 'dp' is not 'DataPoint' object but {}".format(dp) )
+
+        key = self._sortkey(dp,bw,side)
+        position = bisect_right(self._keys,key)
+
+        if position == len(self._keys) :
+            self._keys.append(key)
+            self._data.append(dp)
+            if len(self._data) == 1 or self._data[-2].symbol != dp.symbol :
+                self._chunk_starts.append(position)
+            return len(self._chunk_starts) - 1
+
+        # regroup from the chunk before the inserted one, which can be merged.
+        first = max(bisect_right(self._chunk_starts,position) - 2, 0)
+        old_bounds = [ ( start + ( start >= position ), end + ( end > position ) )
+                       for start, end in self._chunk_bounds(first) ]
+
+        self._keys.insert(position,key)
+        self._data.insert(position,dp)
+        self._regroup(first)
+
+        for i, (old, new) in enumerate(zip(old_bounds, self._chunk_bounds(first)), start=first) :
+            if old != new or new[0] <= position < new[1] :
+                return i
+
+
+    def push_upper(self,dp:DataPoint,bw:Optional[str]=None) :
+        """Pushes upper datapoint.
+
+        Args :
+            dp : 'DataPoint' object for '^'s of zigzag detection.
+            bw : 'black' or 'white' of datapoint. (optional, pass on every push or never.)
+
+        Returns : index of the first chunk modified.
+        """
+        return self._push(dp,bw,0)
+
+
+    def push_lower(self,dp:DataPoint,bw:Optional[str]=None) :
+        """Pushes lower datapoint.
+
+        Args :
+            dp : 'DataPoint' object for 'v's of zigzag detection.
+            bw : 'black' or 'white' of datapoint. (optional, pass on every push or never.)
+
+        Returns : index of the first chunk modified.
+        """
+        return self._push(dp,bw,1)
+
+
+    def get_chunk(self,idx) :
+        """Returns 'Chunk' object of chunk 'idx'."""
+        starts = self._chunk_starts + [len(self._data)]
+        idx = range(len(self))[idx]
+        return Chunk(self._data[starts[idx]:starts[idx+1]],symbol=self._data[starts[idx]].symbol)
+
+
+    @property
+    def chunks(self) :
+        """'Chunks' object of all pushed datapoints."""
+        return Chunks.create_from_datapoints(DataPoints(self._data))
@@ -1,5 +1,8 @@
 from .candle     import Candle
 from .candles    import Candles
+from .streaming_candles import StreamingCandles
+from .candles_panel import CandlesPanel
+from .tick_bar_aggregator import TickBarAggregator
 from .datapoint  import DataPoint
 from .datapoints import DataPoints
 from .chunk      import Chunk
@@ -1,139 +1,527 @@
 import numpy as np
 from . candle import Candle
+from . utils.array_utils import readonly_view, as_float_column, as_date_column, segment_starts
+from . utils.candles_file import save_columns, open_columns
+from . utils.resample_utils import period_keys, aggregate_ohlcv, as_tick_arrays, tick_bar_keys
 
 class Candles() :
     """Represents historical candle data and then provides many utilities.
     'Candles' object is list like object which supports slicing.
     Use like : candles[1], candles[1:3:2]
     You can also use like : candles[[0,2,5]], to extract arbitral candle data.
+
+    Candle data is stored column by column in numpy arrays (open, high, low, close, volume,
+    date and index), and 'Candle' objects are created only when a single element is accessed.
+    Slicing returns 'Candles' object sharing the arrays (no copy), and fancy indexing returns
+    'Candles' object with compact copies of the arrays.
     """
-    
+
     def __init__(self, list_of_candles) :
         """
         Init.
-        
+
         Args :
             list_of_candles : list of 'Candle' objects.
         """
-        
-        self._candles = list_of_candles
 
-        
+        list_of_candles = list(list_of_candles)
+
+        dates = None
+        if any( c.date is not None for c in list_of_candles ) :
+            dates = [ c.date for c in list_of_candles ]
+
+        indices = None
+        if all( c.index is not None for c in list_of_candles ) :
+            indices = [ c.index for c in list_of_candles ]
+
+        self._set_columns( self._build_columns(
+            opens  =[ c.open  for c in list_of_candles ],
+            highs  =[ c.high  for c in list_of_candles ],
+            lows   =[ c.low   for c in list_of_candles ],
+            closes =[ c.close for c in list_of_candles ],
+            volumes=[ np.nan if c.volume is None else c.volume for c in list_of_candles ],
+            dates  =dates,
+            indices=indices ) )
+
+
+    @staticmethod
+    def _build_columns(opens, highs, lows, closes, volumes=None, dates=None, indices=None) :
+
+        opens = as_float_column(opens)
+        n = len(opens)
+
+        columns = {
+            'open'   : opens,
+            'high'   : as_float_column(highs),
+            'low'    : as_float_column(lows),
+            'close'  : as_float_column(closes),
+            'volume' : as_float_column(volumes, n),
+            'date'   : as_date_column(dates),
+            'index'  : np.arange(n) if indices is None else np.asarray(indices),
+        }
+
+        for name, column in columns.items() :
+            if column is not None and len(column) != n :
+                raise Exception("length of '{}' column is {}, but expected {}.".format(name, len(column), n))
+
+        return columns
+
+
+    def _set_columns(self, columns) :
+        self._columns = columns
+        self._cache = {}
+
+
+    @classmethod
+    def _create_from_columns(cls, columns) :
+        obj = cls.__new__(cls)
+        obj._set_columns(columns)
+        return obj
+
+
+    def _new(self, columns) :
+        return self.__class__._create_from_columns(columns)
+
+
+    def _take(self, idx) :
+        return self._new({ name : None if column is None else column[idx]
+                           for name, column in self._columns.items() })
+
+
+    def _create_candle(self, i) :
+
+        columns = self._columns
+        volume = columns['volume'][i]
+
+        return Candle(open  =columns['open'][i],
+                      high  =columns['high'][i],
+                      low   =columns['low'][i],
+                      close =columns['close'][i],
+                      date  =None if columns['date'] is None else columns['date'][i],
+                      volume=None if np.isnan(volume) else volume,
+                      index =columns['index'][i] )
+
+
     def __iter__(self) :
-        
-        for c in self._candles :
-            yield c
-            
-        
+
+        for i in range(len(self)) :
+            yield self._create_candle(i)
+
+
     def __len__(self) :
-        return len(self._candles)
-    
-        
+        return len(self._columns['open'])
+
+
     def __getitem__(self, idx) :
-        
+
         if hasattr(idx, '__iter__') :
-            return self.__class__([ self._candles[int(i)] for i in idx])
+            idx = np.asarray(idx)
+            if idx.dtype != bool :
+                idx = idx.astype(np.intp)
+            return self._take(idx)
         elif isinstance(idx, slice) :
-            return self.__class__(self._candles[idx])
+            return self._take(idx)
         else :
-            return self._candles[idx]
-        
-        
+            n = len(self)
+            if not -n <= idx < n :
+                raise IndexError('candle index out of range')
+            return self._create_candle(idx % n)
+
+
     def __repr__(self) :
         s = '{}([{}])'.format(
             self.__class__.__name__,
             ','.join([ repr(c) for c in self ]))
         return s
-    
-    
+
+
     def __str__(self) :
         s = '{}([\n{}\n])'.format(
             self.__class__.__name__,
             '\n,'.join([ '  OHLCV = ({}, {}, {}, {}, {})'.format(c.open, c.high, c.low, c.close, c.volume) for c in self ]))
         return s
-        
-    
+
+
+    def _index_lookup(self) :
+        """Returns lazily built lookup table of 'index' column.
+        If indices are contiguous integers, positional offset is used,
+        otherwise sorted indices with sorter is used.
+        """
+
+        if 'index_lookup' not in self._cache :
+
+            indices = self._columns['index']
+            n = len(indices)
+
+            lookup = { 'offset' : None, 'sorter' : None, 'sorted' : None, 'unique' : True }
+            if indices.dtype.kind in 'iu' and ( n == 0 or \
+                    ( indices[-1] - indices[0] == n - 1 and np.all(np.diff(indices) == 1) ) ) :
+                lookup['offset'] = indices[0] if n > 0 else 0
+            else :
+                try :
+                    sorter = np.argsort(indices, kind='stable')
+                    sorted_indices = indices[sorter]
+                    lookup.update({ 'sorter' : sorter,
+                                    'sorted' : sorted_indices,
+                                    'unique' : bool(np.all(sorted_indices[1:] != sorted_indices[:-1])) })
+                except TypeError :
+                    lookup['unique'] = False
+
+            self._cache['index_lookup'] = lookup
+
+        return self._cache['index_lookup']
+
+
+    def _positions_by_index(self, index) :
+        """Returns sorted positions of candles whose index is in 'index'."""
+
+        indices = self._columns['index']
+        index = np.asarray(index).ravel()
+        lookup = self._index_lookup()
+
+        if lookup['offset'] is not None :
+            try :
+                positions = index.astype(np.int64)
+            except (TypeError, ValueError) :
+                return np.flatnonzero(np.isin(indices, index))
+            valid = ( positions == index ) & ( positions >= lookup['offset'] ) \
+                    & ( positions < lookup['offset'] + len(indices) )
+            positions = positions[valid] - lookup['offset']
+
+        elif lookup['unique'] :
+            sorted_indices = lookup['sorted']
+            if len(sorted_indices) == 0 :
+                return np.array([], dtype=np.intp)
+            left = np.searchsorted(sorted_indices, index, side='left')
+            found = sorted_indices[np.minimum(left, len(sorted_indices)-1)] == index
+            positions = lookup['sorter'][left[found & (left < len(sorted_indices))]]
+
+        else :
+            return np.flatnonzero(np.isin(indices, index))
+
+        return np.unique(positions)
+
+
     def extract_candles_by_index(self, index) :
+        """Extracts candles by 'index' values (not by position).
+
+        Args :
+            index : an index value or iterable of index values.
+
+        Returns : 'Candle' object (or None if not found) for an index value,
+                  'Candles' object ordered as original for iterable of index values.
+        """
         if hasattr(index, '__iter__') :
-            return self.__class__([ c for c in self if c.index in index ])
+            return self[self._positions_by_index(index)]
+        else :
+            positions = self._positions_by_index([index])
+            if len(positions) > 0 :
+                return self._create_candle(positions[0])
+
+
+    def _date_lookup(self) :
+
+        if 'date_lookup' not in self._cache :
+
+            dates = self._columns['date']
+            if dates is None :
+                raise Exception("candles have no date.")
+
+            if np.all(dates[1:] >= dates[:-1]) :
+                lookup = { 'sorter' : None, 'sorted' : dates }
+            else :
+                sorter = np.argsort(dates, kind='stable')
+                lookup = { 'sorter' : sorter, 'sorted' : dates[sorter] }
+
+            self._cache['date_lookup'] = lookup
+
+        return self._cache['date_lookup']
+
+
+    @staticmethod
+    def _as_date(date, dtype) :
+        if dtype.kind != 'M' :
+            return date
+        if getattr(date, 'tzinfo', None) is not None :
+            date = date.replace(tzinfo=None)
+        return np.datetime64(date).astype(dtype)
+
+
+    def between(self, start_date=None, end_date=None) :
+        """Returns candles from 'start_date' to 'end_date' (both inclusive) using binary search.
+        Returned candles share the arrays if dates are sorted.
+
+        Args :
+            start_date : start date. (optional, if not set, from the first candle.)
+            end_date   : end date. (optional, if not set, to the last candle.)
+
+        Returns : 'Candles' object.
+        """
+
+        lookup = self._date_lookup()
+        sorted_dates = lookup['sorted']
+
+        lo, hi = 0, len(sorted_dates)
+        if start_date is not None :
+            lo = np.searchsorted(sorted_dates, self._as_date(start_date, sorted_dates.dtype), side='left')
+        if end_date is not None :
+            hi = np.searchsorted(sorted_dates, self._as_date(end_date, sorted_dates.dtype), side='right')
+        hi = max(lo, hi)
+
+        if lookup['sorter'] is None :
+            return self[lo:hi]
         else :
-            for c in self :
-                if c.index == index :
-                    return c
-    
+            return self[np.sort(lookup['sorter'][lo:hi])]
+
+
+    def _derived(self, name, func) :
+        if name not in self._cache :
+            self._cache[name] = readonly_view(func())
+        return self._cache[name]
+
 
     @property
     def indices(self):
-        return np.array([c.index for c in self])
-        
+        return readonly_view(self._columns['index'])
+
 
     @property
     def dates(self):
-        return np.array([c.date for c in self])
-    
+        """dates of candles. (array of None if candles have no date.)"""
+        dates = self._columns['date']
+        if dates is None :
+            return np.full(len(self), None, dtype=object)
+        return readonly_view(dates)
+
 
     @property
     def volumes(self):
-        return np.array([c.volume for c in self])
-    
+        return readonly_view(self._columns['volume'])
+
 
     @property
     def opens(self):
-        return np.array([c.open for c in self])
-    
+        return readonly_view(self._columns['open'])
+
 
     @property
     def highs(self):
-        return np.array([c.high for c in self])
-    
+        return readonly_view(self._columns['high'])
+
 
     @property
     def lows(self):
-        return np.array([c.low for c in self])
-    
+        return readonly_view(self._columns['low'])
+
 
     @property
     def closes(self):
-        return np.array([c.close for c in self])
-    
+        return readonly_view(self._columns['close'])
+
 
     @property
     def candle_tops(self):
-        return np.array([c.candle_top for c in self])
-    
+        return self._derived('candle_top', lambda : np.where(self.opens < self.closes, self.closes, self.opens))
+
 
     @property
     def candle_bottoms(self):
-        return np.array([c.candle_bottom for c in self])
-    
+        return self._derived('candle_bottom', lambda : np.where(self.opens < self.closes, self.opens, self.closes))
+
 
     @property
     def black_or_whites(self):
-        return np.array([c.black_or_white for c in self])
+        return self._derived('black_or_white', lambda : np.where(self.opens < self.closes, 'white', 'black'))
+
+
+    @property
+    def is_whites(self):
+        """boolean array which is True for white candles. (open < close)"""
+        return self._derived('is_white', lambda : self.opens < self.closes)
+
+
+    @classmethod
+    def create_from_arrays(cls, opens, highs, lows, closes, volumes=None, dates=None, indices=None) :
+        """
+        Creates 'Candles' objects with column arrays.
+        Arrays which are already contiguous float64 are used without copy.
+
+        Args :
+            opens   : open prices.
+            highs   : high prices.
+            lows    : low prices.
+            closes  : close prices.
+            volumes : volumes. (optional)
+            dates   : dates. (optional)
+            indices : indices. (optional, if not set, indexing starts from 0.)
+        """
+
+        return cls._create_from_columns( cls._build_columns(
+            opens, highs, lows, closes, volumes=volumes, dates=dates, indices=indices ) )
 
 
     @classmethod
     def create_from_pandas(cls, pdf) :
         """
-        Creates 'Candles' objects with Pandas dataframe. 
+        Creates 'Candles' objects with Pandas dataframe.
         Indexing starts from 0.
-        
+        Columns are copied out as numpy arrays at once (no row iteration).
+        Time zone aware dates are stored as naive local times.
+
         Args :
-            pdf : pandas dataframe. 
+            pdf : pandas dataframe.
                 dataframe must have at least these columns : 'Open', 'High', 'Low', 'Close'.
                 dataframe can have these columns : 'Date', 'Volume'.
         """
-        
-        list_of_candles = []
-        for i, r in pdf.reset_index().iterrows() :
-            
-            c = Candle(open=r['Open'], 
-                   high=r['High'], 
-                   low =r['Low'],
-                   close=r['Close'], 
-                   date  =r.get('Date',None),
-                   volume=r.get('Volume',None),
-                   index = i )
-            list_of_candles.append(c)
-            
-        return cls(list_of_candles)
+
+        pdf = pdf.reset_index()
+
+        def to_float_array(name) :
+            return pdf[name].to_numpy(dtype=np.float64, copy=True)
+
+        dates = None
+        if 'Date' in pdf.columns :
+            dates = pdf['Date']
+            if getattr(dates.dtype, 'tz', None) is not None :
+                dates = dates.dt.tz_localize(None)
+            dates = dates.to_numpy()
+
+        volumes = None
+        if 'Volume' in pdf.columns :
+            volumes = to_float_array('Volume')
+
+        return cls.create_from_arrays(opens  =to_float_array('Open'),
+                                      highs  =to_float_array('High'),
+                                      lows   =to_float_array('Low'),
+                                      closes =to_float_array('Close'),
+                                      volumes=volumes,
+                                      dates  =dates )
+
+
+    def resample(self, rule) :
+        """
+        Returns candles aggregated to longer bars, with segment reductions on column arrays.
+        open/close are first/last value, high/low are max/min and volume is sum of each bar.
+
+        Args :
+            rule : integer or period string.
+                integer -- number of bars aggregated to a bar.
+                string  -- calendar period on dates, like '5min', '1h', 'D', 'W' or 'M'.
+                           units are 's', 'min' ('T'), 'h' ('H'), 'D', 'W' (monday start),
+                           'M' ('MS') and 'Y' ('YS', 'A', 'AS'). dates must be sorted.
+                           multiple periods like '3D' are counted from 1970-01-01.
+
+        Returns : 'Candles' object (of the same class, see '_new') indexed from 0. dates are start date of periods for
+                  period string rule, and date of the first bar for integer rule.
+        """
+
+        columns = self._columns
+        dates = columns['date']
+
+        if isinstance(rule, str) :
+            if dates is None :
+                raise Exception("candles have no date to resample by '{}'.".format(rule))
+            keys, to_dates = period_keys(dates, rule)
+            if np.any(keys[1:] < keys[:-1]) :
+                raise Exception("dates must be sorted to resample by '{}'.".format(rule))
+            starts = segment_starts(keys)
+            new_dates = to_dates(keys[starts])
+        else :
+            if not isinstance(rule, (int, np.integer)) or isinstance(rule, bool) or rule < 1 :
+                raise Exception("'rule' must be positive integer or period string but {}.".format(rule))
+            starts = np.arange(0, len(self), rule)
+            new_dates = None if dates is None else dates[starts]
+
+        opens, highs, lows, closes, volumes = aggregate_ohlcv(
+            starts, columns['open'], columns['high'], columns['low'], columns['close'], columns['volume'] )
+
+        return self._new( self._build_columns(opens, highs, lows, closes, volumes=volumes, dates=new_dates) )
+
+
+    def save(self, path) :
+        """
+        Saves candles to 'path' in binary format which can be opened by 'Candles.open_mmap'.
+        The file holds a small header and raw column arrays (one file per symbol).
+
+        Args :
+            path : file path.
+        """
+        attrs = {}
+        if self._columns['date'] is not None :
+            attrs['sorted_dates'] = self._date_lookup()['sorter'] is None
+        save_columns(path, self._columns, attrs=attrs)
+
+
+    @classmethod
+    def open_mmap(cls, path) :
+        """
+        Opens candles file saved by 'Candles.save' with memory-mapped columns.
+        The file is not read into memory, and only touched pages are loaded by OS,
+        i.e. candles.between(start_date, end_date) reads only the date range.
+
+        Args :
+            path : file path.
+
+        Returns : 'Candles' object with read-only memory-mapped columns.
+        """
+        columns, attrs = open_columns(path)
+        columns.setdefault('date', None)
+
+        obj = cls._create_from_columns(columns)
+        if attrs.get('sorted_dates', False) :
+            # skip checking order of whole date column on 'between' call.
+            obj._cache['date_lookup'] = { 'sorter' : None, 'sorted' : columns['date'] }
+        return obj
+
+
+    @classmethod
+    def create_from_ticks(cls, timestamps, prices, sizes=None, bar='time', bar_size='1min') :
+        """
+        Creates 'Candles' objects by aggregating trades (ticks) into bars,
+        in a single vectorized pass over sorted tick arrays.
+        Use 'TickBarAggregator' to aggregate ticks incrementally.
+
+        Args :
+            timestamps : timestamps of ticks. must be sorted.
+            prices : trade prices of ticks.
+            sizes : trade sizes of ticks. (optional for time and tick bar)
+            bar : 'time', 'tick' or 'volume'. default='time'.
+                'time'   -- bar for each calendar period 'bar_size', like '1min'. see 'Candles.resample'.
+                'tick'   -- bar for each 'bar_size' ticks.
+                'volume' -- bar for each 'bar_size' volume. a bar is closed by the tick which
+                            makes total volume reach the threshold.
+            bar_size : size of bar, depends on 'bar'. default='1min'.
+
+        Returns : 'Candles' object indexed from 0. dates are start date of periods for time bar,
+                  and timestamp of the first tick for tick and volume bar.
+        """
+
+        timestamps, prices, sizes = as_tick_arrays(timestamps, prices, sizes)
+        keys, _, to_dates = tick_bar_keys(timestamps, sizes, bar, bar_size)
+
+        starts = segment_starts(keys)
+        volumes = np.full(len(prices), np.nan) if sizes is None else sizes
+        opens, highs, lows, closes, volumes = aggregate_ohlcv(starts, prices, prices, prices, prices, volumes)
+
+        return cls.create_from_arrays(opens, highs, lows, closes, volumes=volumes,
+                                      dates=to_dates(keys[starts], starts))
+
+
+    def to_pandas(self) :
+        """
+        Returns Pandas dataframe with 'Open', 'High', 'Low', 'Close' and 'Volume' columns.
+        Dates are set as index named 'Date' if candles have dates.
+        """
+
+        import pandas as pd
+
+        index = None
+        if self._columns['date'] is not None :
+            index = pd.Index(self._columns['date'], name='Date')
+
+        return pd.DataFrame({ 'Open'   : self._columns['open'],
+                              'High'   : self._columns['high'],
+                              'Low'    : self._columns['low'],
+                              'Close'  : self._columns['close'],
+                              'Volume' : self._columns['volume'] },
+                            index=index, copy=True)
@@ -0,0 +1,225 @@
+import numpy as np
+from typing import List, Literal, Optional
+from . candles import Candles
+from . utils.array_utils import readonly_view
+
+
+class CandlesPanel() :
+    """Represents candle data of many symbols, for universe-wide batch computation.
+    Columns are stored in 2-D (symbol x time) arrays padded with NaN, and each symbol
+    occupies [offset, offset+length) of its row, so ragged histories are supported.
+    Use like : panel[0], panel['AAPL'], to get 'Candles' object of a symbol (no copy).
+    """
+
+    def __init__(self, list_of_candles:List[Candles], symbols:Optional[List[str]]=None,
+                 align:Literal['left','right']='right') :
+        """Init.
+
+        Args :
+            list_of_candles : list of 'Candles' objects.
+            symbols : symbol names of candles. (optional, if not set, 0,1,2,... are used.)
+            align : 'left' or 'right', to align histories to the first or last column.
+                    default='right', i.e. latest bars are lined up.
+        """
+
+        lengths = np.array([ len(c) for c in list_of_candles ], dtype=np.int64)
+        size = int(lengths.max()) if len(lengths) > 0 else 0
+
+        if align == 'right' :
+            offsets = size - lengths
+        elif align == 'left' :
+            offsets = np.zeros(len(lengths), dtype=np.int64)
+        else :
+            raise Exception("invalid value for 'align' : {}.".format(align))
+
+        has_date = any( c._columns['date'] is not None for c in list_of_candles )
+
+        columns = {
+            'open'   : np.full((len(lengths), size), np.nan),
+            'high'   : np.full((len(lengths), size), np.nan),
+            'low'    : np.full((len(lengths), size), np.nan),
+            'close'  : np.full((len(lengths), size), np.nan),
+            'volume' : np.full((len(lengths), size), np.nan),
+            'date'   : np.full((len(lengths), size), np.datetime64('NaT'), dtype='datetime64[ns]') if has_date else None,
+            'index'  : np.full((len(lengths), size), -1, dtype=np.int64),
+        }
+
+        for s, (candles, offset, length) in enumerate(zip(list_of_candles, offsets, lengths)) :
+            for name, column in columns.items() :
+                if column is None or candles._columns[name] is None :
+                    continue
+                column[s, offset:offset+length] = candles._columns[name]
+
+        self._set_columns(columns, lengths, offsets, symbols)
+
+
+    def _set_columns(self, columns, lengths, offsets, symbols=None) :
+
+        n = len(lengths)
+        if symbols is None :
+            symbols = list(range(n))
+        if len(symbols) != n :
+            raise Exception("length of 'symbols' is {}, but expected {}.".format(len(symbols), n))
+
+        self._columns = columns
+        self._lengths = np.asarray(lengths, dtype=np.int64)
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._symbols = list(symbols)
+        self._symbol_positions = { symbol : i for i, symbol in enumerate(self._symbols) }
+        self._cache = {}
+
+
+    @classmethod
+    def create_from_arrays(cls, opens, highs, lows, closes, volumes=None, dates=None, indices=None,
+                           lengths=None, offsets=None, symbols=None) :
+        """Creates 'CandlesPanel' object with 2-D (symbol x time) column arrays (no copy).
+
+        Args :
+            opens, highs, lows, closes : 2-D price arrays.
+            volumes : 2-D volume array. (optional)
+            dates : 2-D date array. (optional)
+            indices : 2-D index array. (optional, if not set, indexing starts from 0 for each symbol.)
+            lengths : number of bars of each symbol. (optional, if not set, full rows are used.)
+            offsets : start column of each symbol. (optional, if not set, 0.)
+            symbols : symbol names. (optional)
+        """
+
+        opens = np.asarray(opens, dtype=np.float64)
+        n, size = opens.shape
+
+        lengths = np.full(n, size, dtype=np.int64) if lengths is None else np.asarray(lengths)
+        offsets = np.zeros(n, dtype=np.int64) if offsets is None else np.asarray(offsets)
+
+        if indices is None :
+            indices = np.arange(size)[np.newaxis,:] - offsets[:,np.newaxis]
+
+        columns = {
+            'open'   : opens,
+            'high'   : np.asarray(highs, dtype=np.float64),
+            'low'    : np.asarray(lows, dtype=np.float64),
+            'close'  : np.asarray(closes, dtype=np.float64),
+            'volume' : np.full((n, size), np.nan) if volumes is None else np.asarray(volumes, dtype=np.float64),
+            'date'   : None if dates is None else np.asarray(dates),
+            'index'  : np.asarray(indices),
+        }
+
+        for name, column in columns.items() :
+            if column is not None and column.shape != (n, size) :
+                raise Exception("shape of '{}' column is {}, but expected {}.".format(name, column.shape, (n, size)))
+
+        obj = cls.__new__(cls)
+        obj._set_columns(columns, lengths, offsets, symbols)
+        return obj
+
+
+    def __len__(self) :
+        return len(self._lengths)
+
+
+    def __iter__(self) :
+        for i in range(len(self)) :
+            yield self[i]
+
+
+    def __repr__(self) :
+        s = '{}(symbols={}, lengths={})'.format(self.__class__.__name__, self._symbols, self._lengths.tolist())
+        return s
+
+
+    def __getitem__(self, symbol) :
+        """Returns 'Candles' object of 'symbol' (symbol name or position) sharing the panel arrays."""
+
+        if symbol in self._symbol_positions :
+            i = self._symbol_positions[symbol]
+        elif isinstance(symbol, (int, np.integer)) and -len(self) <= symbol < len(self) :
+            i = symbol % len(self)
+        else :
+            raise KeyError(symbol)
+
+        window = slice(self._offsets[i], self._offsets[i] + self._lengths[i])
+        return Candles._create_from_columns({ name : None if column is None else column[i, window]
+                                              for name, column in self._columns.items() })
+
+
+    @property
+    def symbols(self) :
+        return list(self._symbols)
+
+
+    @property
+    def lengths(self) :
+        return readonly_view(self._lengths)
+
+
+    @property
+    def offsets(self) :
+        return readonly_view(self._offsets)
+
+
+    @property
+    def shape(self) :
+        return self._columns['open'].shape
+
+
+    @property
+    def mask(self) :
+        """2-D boolean array which is True where bars exist."""
+        if 'mask' not in self._cache :
+            columns = np.arange(self.shape[1])[np.newaxis,:]
+            self._cache['mask'] = readonly_view(
+                ( columns >= self._offsets[:,np.newaxis] ) & ( columns < (self._offsets + self._lengths)[:,np.newaxis] ) )
+        return self._cache['mask']
+
+
+    def _derived(self, name, func) :
+        if name not in self._cache :
+            self._cache[name] = readonly_view(func())
+        return self._cache[name]
+
+
+    @property
+    def indices(self) :
+        return readonly_view(self._columns['index'])
+
+
+    @property
+    def dates(self) :
+        """2-D dates. (None if candles have no date.)"""
+        dates = self._columns['date']
+        if dates is not None :
+            return readonly_view(dates)
+
+
+    @property
+    def volumes(self) :
+        return readonly_view(self._columns['volume'])
+
+
+    @property
+    def opens(self) :
+        return readonly_view(self._columns['open'])
+
+
+    @property
+    def highs(self) :
+        return readonly_view(self._columns['high'])
+
+
+    @property
+    def lows(self) :
+        return readonly_view(self._columns['low'])
+
+
+    @property
+    def closes(self) :
+        return readonly_view(self._columns['close'])
+
+
+    @property
+    def candle_tops(self) :
+        return self._derived('candle_top', lambda : np.where(self.opens < self.closes, self.closes, self.opens))
+
+
+    @property
+    def candle_bottoms(self) :
+        return self._derived('candle_bottom', lambda : np.where(self.opens < self.closes, self.opens, self.closes))
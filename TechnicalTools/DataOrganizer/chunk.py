@@ -7,21 +7,20 @@ from . datapoints import DataPoints
 
 class Chunk() :
     """Datapoints chunk. 'Chunk' object is list like object which support slicing.
+    Chunk of 'Chunks' object is a thin view of its datapoint arrays.
     """
-    
+
     def __init__(self,list_of_data_point:Union[DataPoints,List[DataPoint]],symbol:Optional[str]=None) :
-        
-        if isinstance(list_of_data_point, DataPoints) :
-            list_of_data_point = [ dp for dp in DataPoints ]
+
         self._data = list_of_data_point
         self._symbol = symbol
 
-        
+
     def __iter__(self) :
         for dp in self._data :
             yield dp
 
-            
+
     def __repr__(self) :
         s = 'Chunk([{}], symbol=\'{}\')'.format(
             ','.join([ repr(dp) for dp in self ]), self.symbol )
@@ -33,8 +32,8 @@ class Chunk() :
             self.symbol,
             '\n,'.join([ str(dp) for dp in self]) )
         return s
-    
-    
+
+
     def __len__(self) :
         return len(self._data)
 
@@ -42,11 +41,13 @@ class Chunk() :
     @property
     def symbol(self) :
         return self._symbol
-    
-    
+
+
     def __getitem__(self,idx):
-        
-        if hasattr(idx,'__iter__') :
+
+        if isinstance(self._data,DataPoints) and ( hasattr(idx,'__iter__') or isinstance(idx,slice) ) :
+            return self.__class__( self._data[idx], self.symbol )
+        elif hasattr(idx,'__iter__') :
             return self.__class__([ self._data[i] for i in idx ], self.symbol )
         elif isinstance(idx,slice) :
             return self.__class__( self._data[idx], self.symbol )
@@ -57,13 +58,19 @@ class Chunk() :
     def append(self,dp) :
         if not isinstance(dp,DataPoint) :
             raise Exception("variable 'dp' is not 'DataPoint' object but {}".format(dp) )
+        if isinstance(self._data,DataPoints) :
+            self._data = list(self._data)
         self._data.append(dp)
 
 
     def to_datapoints(self) :
+        if isinstance(self._data,DataPoints) :
+            return self._data
         return DataPoints(self._data)
 
 
     def copy(self) :
         """Returns copy of 'Chunk' objects."""
-        return self.__class__(self, self.symbol)
+        if isinstance(self._data,DataPoints) :
+            return self.__class__(self._data.copy(), self.symbol)
+        return self.__class__(list(self._data), self.symbol)
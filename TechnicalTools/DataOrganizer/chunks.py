@@ -1,65 +1,194 @@
+import numpy as np
 from typing import List
 
 from . chunk import Chunk
 from . datapoints import DataPoints
+from . utils.array_utils import readonly_view, encode_symbols, decode_symbols, segment_starts
 
 
 class Chunks() :
     """list of 'Chunk' objects and its utility methods.
     'Chunks' object is list like object which support slicing.
+
+    Datapoints of all chunks are stored in a flat 'DataPoints' object, and chunk i
+    is datapoints[offsets[i]:offsets[i+1]] (CSR layout) with symbol code of chunk i.
+    So 'to_datapoints' is zero-copy, symbol filtering is a boolean mask,
+    and per-chunk reductions are segment operations. (see 'reduce_by_chunk')
     """
-    
+
     def __init__(self,list_of_chunks:List[Chunk]) :
-        
-        self._data = list_of_chunks
-    
-    
+
+        list_of_chunks = list(list_of_chunks)
+
+        lengths = np.array([ len(c) for c in list_of_chunks ], dtype=np.int64)
+        codes, table = encode_symbols([ c.symbol for c in list_of_chunks ])
+
+        self._set_csr( DataPoints.concatenate([ c.to_datapoints() for c in list_of_chunks ]),
+                       np.concatenate(([0], np.cumsum(lengths))), codes, table )
+
+
+    def _set_csr(self,datapoints,offsets,symbol_codes,symbol_table) :
+        self._datapoints = datapoints
+        self._offsets = offsets
+        self._symbol_codes = symbol_codes
+        self._symbol_table = symbol_table
+
+
+    @classmethod
+    def _create_from_csr(cls,datapoints,offsets,symbol_codes,symbol_table) :
+        obj = cls.__new__(cls)
+        obj._set_csr(datapoints,offsets,symbol_codes,symbol_table)
+        return obj
+
+
+    @classmethod
+    def create_from_datapoints(cls,datapoints:DataPoints) :
+        """Returns new 'Chunks' objects grouping contiguous datapoints with the same symbol into a chunk.
+        Chunks share the arrays of 'datapoints'. (no copy)
+
+        Args :
+            datapoints : 'DataPoints' objects.
+        """
+
+        codes = datapoints._columns['symbol']
+        starts = segment_starts(codes)
+
+        return cls._create_from_csr(datapoints, np.append(starts, len(codes)).astype(np.int64),
+                                    codes[starts], datapoints._symbol_table)
+
+
+    def _take_chunks(self,positions) :
+        """Returns chunks at 'positions' gathering datapoints with segment expansion."""
+
+        positions = np.asarray(positions,dtype=np.intp)
+        starts  = self._offsets[:-1][positions]
+        lengths = np.diff(self._offsets)[positions]
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+
+        flat = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        return self._create_from_csr(self._datapoints[flat], offsets,
+                                     self._symbol_codes[positions], self._symbol_table)
+
+
     def __iter__(self) :
-        for c in self._data :
-            yield c
-    
-    
+        for i in range(len(self)) :
+            yield self[i]
+
+
     def __repr__(self) :
         s = 'Chunks([{}])'.format(','.join([ repr(c) for c in self ]))
         return s
-    
-    
+
+
     def __str__(self) :
         s = 'Chunks(\n[{}])'.format('\n,'.join([ str(c) for c in self ]))
         return s
 
 
     def __len__(self) :
-        return len(self._data)
+        return len(self._offsets) - 1
+
 
-    
     def __getitem__(self,idx):
-        
+
         if hasattr(idx,'__iter__') :
-            return self.__class__([ self._data[i] for i in idx])
+            idx = np.asarray(idx)
+            if idx.dtype == bool :
+                idx = np.flatnonzero(idx)
+            return self._take_chunks(idx)
         elif isinstance(idx,slice) :
-            return self.__class__( self._data[idx] )
+            start, stop, step = idx.indices(len(self))
+            if step != 1 :
+                return self._take_chunks(np.arange(start,stop,step))
+            stop = max(start,stop)
+            o0, o1 = self._offsets[start], self._offsets[stop]
+            return self._create_from_csr(self._datapoints[o0:o1], self._offsets[start:stop+1] - o0,
+                                         self._symbol_codes[start:stop], self._symbol_table)
         else :
-            return self._data[idx]
-    
+            n = len(self)
+            if not -n <= idx < n :
+                raise IndexError('chunk index out of range')
+            idx = idx % n
+            code = self._symbol_codes[idx]
+            return Chunk(self._datapoints[self._offsets[idx]:self._offsets[idx+1]],
+                         symbol=None if code < 0 else self._symbol_table[code])
+
 
     def append(self,chunk:Chunk) :
+        """Appends chunk. Datapoints of 'chunk' are copied into the CSR arrays, so datapoints
+        appended to 'chunk' afterwards are not reflected. Fill the chunk before appending it.
+        Arrays are reallocated on every call (O(n)), so build many chunks with
+        'Chunks(list_of_chunks)' or 'Chunks.create_from_datapoints' instead.
+        Empty chunks are rejected, since they are usually filled after appending.
+        """
         if not isinstance(chunk,Chunk) :
             raise Exception("variable 'chunk' is not 'Chunk' object but {}.".format(chunk) )
-        self._data.append(chunk)
+        if len(chunk) == 0 :
+            raise Exception("empty chunk can not be appended. datapoints are copied on append, "
+                            "so append the chunk after adding its datapoints.")
+        appended = Chunks([chunk])
+        table = { s : i for i, s in enumerate(self._symbol_table) }
+        mapping = np.array([ table.setdefault(s,len(table)) for s in appended._symbol_table ] + [-1], dtype=np.int32)
+        self._set_csr( DataPoints.concatenate([ self._datapoints, appended._datapoints ]),
+                       np.append(self._offsets, self._offsets[-1] + len(chunk)),
+                       np.append(self._symbol_codes, mapping[appended._symbol_codes]).astype(np.int32),
+                       tuple(table) )
 
 
     def to_datapoints(self) :
-        tmp = []
-        for chunk in self :
-            tmp.extend(chunk._data)        
-        return DataPoints(tmp)
+        return self._datapoints
+
 
- 
     def get_chunks_by_symbol(self,symbol) :
-        return self.__class__([c for c in self if c._symbol==symbol])
+        if symbol not in self._symbol_table :
+            return self[[]]
+        return self._take_chunks(np.flatnonzero(self._symbol_codes == self._symbol_table.index(symbol)))
+
+
+    @property
+    def offsets(self) :
+        """start positions of chunks in 'to_datapoints()', followed by total length."""
+        return readonly_view(self._offsets)
+
+
+    @property
+    def lengths(self) :
+        return np.diff(self._offsets)
+
+
+    @property
+    def symbols(self) :
+        """symbol of each chunk."""
+        return decode_symbols(self._symbol_codes, self._symbol_table)
+
+
+    @property
+    def chunk_ids(self) :
+        """chunk number of each datapoint in 'to_datapoints()'."""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+
+    def reduce_by_chunk(self,ufunc,values=None) :
+        """Reduces values of each chunk with segment operation. i.e. reduce_by_chunk(np.maximum)
+        returns max y-value of each chunk. Empty chunks give NaN.
+
+        Args :
+            ufunc : numpy ufunc. i.e. np.maximum, np.minimum, np.add.
+            values : values of datapoints in 'to_datapoints()'. (optional, if not set, y-values are used.)
+        """
+
+        values = self._datapoints.ys if values is None else np.asarray(values)
+        lengths = self.lengths
+        nonempty = lengths > 0
+
+        result = np.full(len(self), np.nan)
+        if np.any(nonempty) :
+            result[nonempty] = ufunc.reduceat(values, self._offsets[:-1][nonempty])
+        return result
 
 
     def copy(self) :
         """Returns copy of 'Chunks' objects."""
-        return self.__class__([c.copy() for c in self])
+        return self._create_from_csr(self._datapoints.copy(), self._offsets.copy(),
+                                     self._symbol_codes.copy(), self._symbol_table)
@@ -1,100 +1,222 @@
 import numpy as np
 from typing import List
 from . datapoint import DataPoint
+from . utils.array_utils import readonly_view, as_column, encode_symbols, decode_symbols
 
 class DataPoints() :
     """'DataPoints' objects stores 'DataPoint' objects and then provides many utilities.
     'DataPoints' object supports slicing.
     Use like : datapoints[1], datapoints[1:3:2]
     You can also use like : datapoints[[0,2,5]], to extract arbitral datapoint data.
+
+    Datapoints are stored in parallel arrays (x, y, index and symbol code), and 'DataPoint'
+    objects are created only when a single element is accessed.
+    Slicing returns 'DataPoints' object sharing the arrays (no copy).
     """
-    
+
     DATA_POINT_CLASS = DataPoint
-    
+
+    OHLCV_ATTRIBUTES = {
+        'O'  : 'opens',
+        'H'  : 'highs',
+        'L'  : 'lows',
+        'C'  : 'closes',
+        'V'  : 'volumes',
+        'CT' : 'candle_tops',
+        'CB' : 'candle_bottoms',
+    }
+
     def __init__(self,list_of_data_point:List[type(DataPoint)]) :
         """Init.
-        
+
         Args :
             list_of_datapoint : list of 'DataPoint' objects.
                                 list elements must be ordered by x.
         """
-        self._data_points = list_of_data_point
+        list_of_data_point = list(list_of_data_point)
+
+        indices = None
+        if any( dp.index is not None for dp in list_of_data_point ) :
+            indices = [ dp.index for dp in list_of_data_point ]
+
+        self._set_columns( *self._build_columns(
+            [ dp.x for dp in list_of_data_point ],
+            [ dp.y for dp in list_of_data_point ],
+            indices,
+            [ dp.symbol for dp in list_of_data_point ] ) )
+
+
+    @staticmethod
+    def _build_columns(xs, ys, indices=None, symbols=None) :
+
+        xs = as_column(xs)
+        ys = as_column(ys)
+
+        if symbols is None :
+            codes, table = np.full(len(xs), -1, dtype=np.int32), ()
+        else :
+            codes, table = encode_symbols(as_column(symbols))
+
+        columns = {
+            'x'      : xs,
+            'y'      : ys,
+            'index'  : None if indices is None else as_column(indices),
+            'symbol' : codes,
+        }
+
+        for name, column in columns.items() :
+            if column is not None and len(column) != len(xs) :
+                raise Exception("length of '{}' values is {}, but expected {}.".format(name, len(column), len(xs)))
+
+        return columns, table
+
+
+    def _set_columns(self, columns, symbol_table) :
+        self._columns = columns
+        self._symbol_table = symbol_table
+        self._cache = {}
+
+
+    @classmethod
+    def _create_from_columns(cls, columns, symbol_table) :
+        obj = cls.__new__(cls)
+        obj._set_columns(columns, symbol_table)
+        return obj
+
+
+    def _take(self, idx, cls=None) :
+        """Returns datapoints at 'idx' (slice, integer array or boolean mask).
+        Subclass attributes are kept unless 'cls' is set.
+        """
+        columns = { name : None if column is None else column[idx]
+                    for name, column in self._columns.items() }
+
+        if cls is not None :
+            return cls._create_from_columns(columns, self._symbol_table)
+
+        obj = self.__class__.__new__(self.__class__)
+        obj.__dict__.update(self.__dict__)
+        obj._set_columns(columns, self._symbol_table)
+        return obj
+
+
+    def _create_data_point(self, i) :
+
+        columns = self._columns
+        code = columns['symbol'][i]
+
+        return self.DATA_POINT_CLASS(columns['x'][i], columns['y'][i],
+                                     index=None if columns['index'] is None else columns['index'][i],
+                                     symbol=None if code < 0 else self._symbol_table[code] )
 
 
     def __iter__(self) :
-        for dp in self._data_points :
-            yield dp
+        for i in range(len(self)) :
+            yield self._create_data_point(i)
+
 
-            
     def __repr__(self) :
         s = '{}([{}])'.format(self.__class__.__name__, ','.join([ repr(dp) for dp in self] ))
         return s
 
-        
+
     def __str__(self) :
-        s = '[{}]'.format('\n,'.join([ '(x={},y={})'.format(dp.x,dp.y) for dp in self ]))
+        s = '[{}]'.format('\n,'.join([ '(x={},y={})'.format(x,y) for x,y in zip(self.xs,self.ys) ]))
         return s
 
-    
+
     def __len__(self) :
-        cnt = 0
-        for _ in self :
-            cnt += 1
-        return cnt
+        return len(self._columns['x'])
+
 
-    
     def __getitem__(self,idx) :
-        tmp = [ dp for dp in self ]
         if hasattr(idx,'__iter__') :
-            return self.__class__([ tmp[i] for i in idx ])
+            idx = np.asarray(idx)
+            if idx.dtype != bool :
+                idx = idx.astype(np.intp)
+            return self._take(idx)
         elif isinstance(idx,slice) :
-            return self.__class__(tmp[idx])
+            return self._take(idx)
         else :
-            return tmp[idx]
+            n = len(self)
+            if not -n <= idx < n :
+                raise IndexError('datapoint index out of range')
+            return self._create_data_point(idx % n)
+
+
+    @classmethod
+    def concatenate(cls,list_of_datapoints) :
+        """Returns new 'DataPoints' objects concatenating column arrays of 'DataPoints' objects.
+
+        Args :
+            list_of_datapoints : list of 'DataPoints' objects.
+        """
+
+        list_of_datapoints = list(list_of_datapoints)
+
+        table = {}
+        codes = []
+        for dps in list_of_datapoints :
+            mapping = np.array([ table.setdefault(s,len(table)) for s in dps._symbol_table ] + [-1], dtype=np.int32)
+            codes.append(mapping[dps._columns['symbol']])
+
+        indices = None
+        if any( dps._columns['index'] is not None for dps in list_of_datapoints ) :
+            indices = np.concatenate([ np.full(len(dps),None,dtype=object) if dps._columns['index'] is None
+                                       else dps._columns['index'] for dps in list_of_datapoints ])
+
+        columns = {
+            'x'      : np.concatenate([ dps._columns['x'] for dps in list_of_datapoints ]) if list_of_datapoints else np.array([]),
+            'y'      : np.concatenate([ dps._columns['y'] for dps in list_of_datapoints ]) if list_of_datapoints else np.array([]),
+            'index'  : indices,
+            'symbol' : np.concatenate(codes) if codes else np.array([], dtype=np.int32),
+        }
+
+        return cls._create_from_columns(columns, tuple(table))
+
 
-    
     @classmethod
     def create_from_xsys(cls,xs,ys,indices=None,symbols=None) :
         """Returns new 'DataPoints' objects from x-coordinate and y-coodinate values.
-        
+
         Args :
             xs : x-coodinate values.
             ys : y-coodinate values.
             indices : index values. (optional)
             symbols : symbol strings. (optional)
         """
-        
-        if indices is not None and symbols is not None :
-            return cls([cls.DATA_POINT_CLASS(x,y,index=i,symbol=symbol) for x,y,i,symbol in zip(xs,ys,indices,symbols) ])
-        elif indices is not None :
-            return cls([cls.DATA_POINT_CLASS(x,y,index=i) for x,y,i in zip(xs,ys,indices) ])
-        elif symbols is not None :
-            return cls([cls.DATA_POINT_CLASS(x,y,symbol=symbol) for x,y,symbol in zip(xs,ys,symbols) ])
-        else :
-            return cls([cls.DATA_POINT_CLASS(x,y) for x,y in zip(xs,ys) ])
+
+        return cls._create_from_columns( *cls._build_columns(xs,ys,indices=indices,symbols=symbols) )
 
 
     @classmethod
     def create_from_coords(cls,coords,indices=None,symbols=None) :
         """Returns new 'DataPoints' objects from (x,y)-coodinate values.
-        
+
         Args :
             coords : (x,y)-coodinate values.
             indices : index values. (optional)
             symbols : symbol strings. (optional)
         """
-        
-        xs = ( c[0] for c in coords)
-        ys = ( c[1] for c in coords)
-        
-        return cls.create_from_xsys(xs,ys,indices=indices,symbols=symbols)
-        
-        
+
+        coords = as_column(coords).reshape(-1,2)
+
+        return cls.create_from_xsys(coords[:,0],coords[:,1],indices=indices,symbols=symbols)
+
+
+    @classmethod
+    def _get_ohlcv_values(cls,candles,ohlcv) :
+        if ohlcv not in cls.OHLCV_ATTRIBUTES :
+            raise Exception("incorrect 'ohlcv' value : '{}'.".format(ohlcv))
+        return getattr(candles,cls.OHLCV_ATTRIBUTES[ohlcv])
+
+
     @classmethod
-    def create_from_candles(cls,candles,ohlcv) :
-        """This class method is used as a convertor from 'Candles' objects to 'DataPoints' objects. 
+    def create_from_candles(cls,candles,ohlcv,symbol=None) :
+        """This class method is used as a convertor from 'Candles' objects to 'DataPoints' objects.
         You must specify 'ohlcv' to convert.
-        
+        y-values share the candle column (no copy).
+
         Args :
             candles : 'Candles' objects.
             ohlcvs : ohlcv to convert. choose within :
@@ -105,59 +227,93 @@ class DataPoints() :
                 'V' -- volume
                 'CT' -- candle top
                 'CB' -- candle bottom
+            symbol : symbol string of datapoints. (optional, if not set, 'ohlcv' is used.)
         """
 
-        xs = np.arange(len(candles))
-        
-        if ohlcv == 'O' :
-            values = candles.opens
-        elif ohlcv == 'H' :
-            values = candles.highs
-        elif ohlcv == 'L' :
-            values = candles.lows
-        elif ohlcv == 'C' :
-            values = candles.closes
-        elif ohlcv == 'V' :
-            values = candles.volumes
-        elif ohlcv == 'CT' :
-            values = candles.candle_tops
-        elif ohlcv == 'CB' :
-            values = candles.candle_bottoms
-        else :
-            raise Exception("incorrect 'ohlcv' value : '{}'.".format(ohlcv))
+        values = cls._get_ohlcv_values(candles,ohlcv)
+
+        columns = {
+            'x'      : np.arange(len(candles)),
+            'y'      : values,
+            'index'  : candles.indices,
+            'symbol' : np.zeros(len(candles), dtype=np.int32),
+        }
+
+        return cls._create_from_columns(columns, (ohlcv if symbol is None else symbol,))
+
+
+    @classmethod
+    def create_from_candles_panel(cls,panel,ohlcv) :
+        """Batched form of 'create_from_candles' for 'CandlesPanel' objects.
+        'ohlcv' values of all symbols are extracted in a single call,
+        and each 'DataPoints' object shares the panel arrays (no copy).
+
+        Args :
+            panel : 'CandlesPanel' objects.
+            ohlcv : ohlcv to convert. see 'create_from_candles'.
+
+        Returns : list of 'DataPoints' objects ordered as panel symbols.
+        """
+
+        values  = cls._get_ohlcv_values(panel,ohlcv)
+        indices = panel.indices
+
+        size = panel.shape[1]
+        xs    = np.arange(size)
+        codes = np.zeros(size, dtype=np.int32)
+
+        list_of_datapoints = []
+        for i, (offset, length) in enumerate(zip(panel.offsets, panel.lengths)) :
+            window = slice(offset, offset+length)
+            columns = {
+                'x'      : xs[:length],
+                'y'      : values[i,window],
+                'index'  : indices[i,window],
+                'symbol' : codes[:length],
+            }
+            list_of_datapoints.append(cls._create_from_columns(columns, (ohlcv,)))
+
+        return list_of_datapoints
+
+
+    def _cached(self, name, func) :
+        if name not in self._cache :
+            self._cache[name] = readonly_view(func())
+        return self._cache[name]
 
-        try :
-            indices = candles.indices
-            return cls([ cls.DATA_POINT_CLASS(x,y,index=i,symbol=ohlcv) for x,y,i in zip(xs,values,indices)])
-        except :
-            return cls([ cls.DATA_POINT_CLASS(x,y,symbol=ohlcv) for x,y in zip(xs,values)])
 
-        
     @property
     def xs(self) :
-        return np.array([ dp.x for dp in self ])
-      
-        
+        return readonly_view(self._columns['x'])
+
+
     @property
     def ys(self) :
-        return np.array([ dp.y for dp in self ])
+        return readonly_view(self._columns['y'])
+
 
-    
     @property
     def coords(self) :
-        return np.array([ c for c in zip(self.xs,self.ys)])
+        return self._cached('coords', lambda : np.column_stack((self._columns['x'],self._columns['y'])))
+
 
-    
     @property
     def indices(self) :
-        return np.array([ dp.index for dp in self])
+        """index values. (array of None if datapoints have no index.)"""
+        indices = self._columns['index']
+        if indices is None :
+            return np.full(len(self), None, dtype=object)
+        return readonly_view(indices)
+
 
-    
     @property
     def symbols(self) :
-        return np.array([ dp.symbol for dp in self])
+        return self._cached('symbols', lambda : decode_symbols(self._columns['symbol'],self._symbol_table))
+
 
-    
     def copy(self) :
         """Returns copy of 'DataPoints' objects."""
-        return self.__class__([ v.copy() for v in self])
+        obj = self._take(slice(None))
+        obj._set_columns({ name : None if column is None else column.copy()
+                           for name, column in self._columns.items() }, self._symbol_table)
+        return obj
@@ -0,0 +1,190 @@
+import numpy as np
+from typing import Optional
+from . candles import Candles
+
+
+class StreamingCandles(Candles) :
+    """'Candles' object for live feeds, which supports appending bars in amortized O(1).
+    If 'capacity' is set, the oldest bars are evicted to keep at most 'capacity' bars.
+
+    Columns are kept in buffers twice as large as the window, and the window is moved
+    to the head of new buffers only when the buffers are filled up. So column properties
+    (opens, highs, ...) are always contiguous views of the current window (no copy).
+    Bars in a buffer are never overwritten, so views, including sliced 'Candles' and
+    'DataPoints' created from them, keep the bars they were created with after appends.
+
+    Index of a bar is the number of bars appended before it, so indices keep counting
+    after old bars are evicted.
+    """
+
+    INITIAL_BUFFER_SIZE = 1024
+
+    def __init__(self, capacity:Optional[int]=None) :
+        """Init.
+
+        Args :
+            capacity : maximum number of bars to keep. (optional, if not set, all bars are kept.)
+        """
+
+        if capacity is not None and capacity < 1 :
+            raise Exception("'capacity' must be positive integer but {}.".format(capacity))
+
+        self._capacity = capacity
+
+        size = self.INITIAL_BUFFER_SIZE if capacity is None else 2*capacity
+        self._buffers = {
+            'open'   : np.empty(size),
+            'high'   : np.empty(size),
+            'low'    : np.empty(size),
+            'close'  : np.empty(size),
+            'volume' : np.empty(size),
+            'date'   : None,
+            'index'  : np.empty(size, dtype=np.int64),
+        }
+        self._start = 0
+        self._stop  = 0
+        self._count = 0
+        self._cache = {}
+
+
+    @property
+    def _columns(self) :
+        start, stop = self._start, self._stop
+        return { name : None if buffer is None else buffer[start:stop]
+                 for name, buffer in self._buffers.items() }
+
+
+    def _set_columns(self, columns) :
+        """Adopts column arrays as buffers, for constructors inherited from 'Candles'.
+        Adopted arrays are never written, since buffers are reallocated on the next append.
+        """
+
+        n = len(columns['open'])
+        self._capacity = None
+        self._buffers = dict(columns)
+        self._start = 0
+        self._stop  = n
+        self._count = n
+        self._cache = {}
+
+
+    def _new(self, columns) :
+        return Candles._create_from_columns(columns)
+
+
+    @property
+    def capacity(self) :
+        return self._capacity
+
+
+    def _reserve(self, k) :
+        """Makes room for 'k' bars at the tail of buffers."""
+
+        size = len(self._buffers['open'])
+        if self._stop + k <= size :
+            return
+
+        n = self._stop - self._start
+        keep = n if self._capacity is None else min(n, max(self._capacity - k, 0))
+
+        new_size = max(size, self.INITIAL_BUFFER_SIZE if self._capacity is None else 2*self._capacity)
+        while keep + k > new_size :
+            new_size *= 2
+
+        # the window is moved into new buffers, so that views of old buffers stay valid.
+        src = slice(self._stop - keep, self._stop)
+        for name, buffer in self._buffers.items() :
+            if buffer is None :
+                continue
+            new_buffer = np.empty(new_size, dtype=buffer.dtype)
+            new_buffer[:keep] = buffer[src]
+            self._buffers[name] = new_buffer
+
+        self._start, self._stop = 0, keep
+
+
+    def _ensure_date_buffer(self) :
+        if self._buffers['date'] is None :
+            buffer = np.empty(len(self._buffers['open']), dtype='datetime64[ns]')
+            buffer[:] = np.datetime64('NaT')
+            self._buffers['date'] = buffer
+
+
+    def _evict(self) :
+        if self._capacity is not None and self._stop - self._start > self._capacity :
+            self._start = self._stop - self._capacity
+        self._cache = {}
+
+
+    def append(self, open:float, high:float, low:float, close:float, volume:Optional[float]=None, date=None) :
+        """Appends a bar in amortized O(1).
+
+        Args :
+            open, high, low, close : prices of the bar.
+            volume : volume of the bar. (optional)
+            date : date of the bar. (optional)
+        """
+
+        self._reserve(1)
+
+        i = self._stop
+        buffers = self._buffers
+        buffers['open'][i]   = open
+        buffers['high'][i]   = high
+        buffers['low'][i]    = low
+        buffers['close'][i]  = close
+        buffers['volume'][i] = np.nan if volume is None else volume
+        buffers['index'][i]  = self._count
+
+        if date is not None :
+            self._ensure_date_buffer()
+        if buffers['date'] is not None :
+            buffers['date'][i] = np.datetime64('NaT') if date is None \
+                                 else self._as_date(date, buffers['date'].dtype)
+
+        self._stop  += 1
+        self._count += 1
+        self._evict()
+
+
+    def extend(self, opens, highs, lows, closes, volumes=None, dates=None) :
+        """Appends bars given as column arrays.
+
+        Args :
+            opens, highs, lows, closes : prices of bars.
+            volumes : volumes of bars. (optional)
+            dates : dates of bars. (optional)
+        """
+
+        columns = self._build_columns(opens, highs, lows, closes, volumes=volumes, dates=dates,
+                                      indices=np.arange(self._count, self._count + len(opens)))
+        k = len(columns['open'])
+        self._count += k
+
+        if self._capacity is not None and k > self._capacity :
+            columns = { name : None if column is None else column[k-self._capacity:]
+                        for name, column in columns.items() }
+            k = self._capacity
+
+        self._reserve(k)
+
+        if columns['date'] is not None :
+            self._ensure_date_buffer()
+
+        dst = slice(self._stop, self._stop + k)
+        for name, buffer in self._buffers.items() :
+            if buffer is None :
+                continue
+            if columns[name] is None :
+                buffer[dst] = np.datetime64('NaT')
+            else :
+                buffer[dst] = columns[name]
+
+        self._stop += k
+        self._evict()
+
+
+    def snapshot(self) :
+        """Returns 'Candles' object with copies of current columns."""
+        return Candles._create_from_columns({ name : None if column is None else column.copy()
+                                              for name, column in self._columns.items() })
@@ -0,0 +1,128 @@
+import numpy as np
+from typing import Literal, Optional
+from . streaming_candles import StreamingCandles
+from . utils.array_utils import segment_starts
+from . utils.resample_utils import aggregate_ohlcv, as_tick_arrays, cumulative_volumes, tick_bar_keys
+
+
+class TickBarAggregator() :
+    """Incremental form of 'Candles.create_from_ticks'.
+    Accepts batches of ticks and appends completed bars into 'StreamingCandles' object.
+    Ticks of the incomplete last bar are kept until the bar is completed,
+    so bars are the same as 'Candles.create_from_ticks' over all ticks.
+    """
+
+    def __init__(self,
+                 bar:Literal['time','tick','volume']='time',
+                 bar_size='1min',
+                 candles:Optional[StreamingCandles]=None) :
+        """Init.
+
+        Args :
+            bar : 'time', 'tick' or 'volume'. see 'Candles.create_from_ticks'.
+            bar_size : size of bar, depends on 'bar'. see 'Candles.create_from_ticks'.
+            candles : 'StreamingCandles' object to append bars.
+                      (optional, if not set, new 'StreamingCandles' object without capacity is used.)
+        """
+
+        self._bar = bar
+        self._bar_size = bar_size
+        self._candles = StreamingCandles() if candles is None else candles
+
+        self._pending = ( np.array([], dtype='datetime64[ns]'), np.array([]), None )
+        self._count_before  = 0
+        self._volume_before = 0.
+
+
+    @property
+    def params(self) :
+        return { 'bar' : self._bar, 'bar_size' : self._bar_size }
+
+
+    @property
+    def candles(self) :
+        """'StreamingCandles' object holding completed bars."""
+        return self._candles
+
+
+    @property
+    def pending_size(self) :
+        """number of ticks of the incomplete bar."""
+        return len(self._pending[1])
+
+
+    def _emit(self, timestamps, prices, sizes, keys, starts, to_dates) :
+
+        volumes = np.full(len(prices), np.nan) if sizes is None else sizes
+        opens, highs, lows, closes, volumes = aggregate_ohlcv(starts, prices, prices, prices, prices, volumes)
+        self._candles.extend(opens, highs, lows, closes, volumes=volumes,
+                             dates=to_dates(keys[starts], starts))
+
+
+    def push(self, timestamps, prices, sizes=None) :
+        """Aggregates a batch of ticks and appends completed bars.
+
+        Args :
+            timestamps : timestamps of ticks. must be sorted and not before pushed ticks.
+            prices : trade prices of ticks.
+            sizes : trade sizes of ticks. (required for volume bar)
+
+        Returns : number of bars appended.
+        """
+
+        timestamps, prices, sizes = as_tick_arrays(timestamps, prices, sizes)
+        if len(prices) == 0 :
+            return 0
+
+        pending_timestamps, pending_prices, pending_sizes = self._pending
+        if len(pending_prices) > 0 and timestamps[0] < pending_timestamps[-1] :
+            raise Exception("'timestamps' must not be before pushed ticks.")
+        if ( sizes is None ) != ( pending_sizes is None ) and len(pending_prices) > 0 :
+            raise Exception("'sizes' must be passed on every push or never.")
+
+        timestamps = np.concatenate((pending_timestamps, timestamps))
+        prices = np.concatenate((pending_prices, prices))
+        if sizes is not None :
+            sizes = sizes if pending_sizes is None else np.concatenate((pending_sizes, sizes))
+
+        keys, end, to_dates = tick_bar_keys(timestamps, sizes, self._bar, self._bar_size,
+                                            count_before=self._count_before, volume_before=self._volume_before)
+
+        starts = segment_starts(keys)
+        completed = np.count_nonzero(keys[starts] < end)
+
+        # ticks of the incomplete bar are kept for next push.
+        split = starts[completed] if completed < len(starts) else len(prices)
+        if completed > 0 :
+            self._emit(timestamps[:split], prices[:split], None if sizes is None else sizes[:split],
+                       keys[:split], starts[:completed], to_dates)
+
+        self._count_before += split
+        if sizes is not None and split > 0 :
+            self._volume_before = cumulative_volumes(sizes[:split], self._volume_before)[-1]
+        self._pending = ( timestamps[split:], prices[split:], None if sizes is None else sizes[split:] )
+
+        return completed
+
+
+    def flush(self) :
+        """Appends the incomplete bar, i.e. at the end of session.
+
+        Returns : number of bars appended.
+        """
+
+        timestamps, prices, sizes = self._pending
+        if len(prices) == 0 :
+            return 0
+
+        keys, _, to_dates = tick_bar_keys(timestamps, sizes, self._bar, self._bar_size,
+                                          count_before=self._count_before, volume_before=self._volume_before)
+        starts = segment_starts(keys)
+        self._emit(timestamps, prices, sizes, keys, starts, to_dates)
+
+        self._count_before += len(prices)
+        if sizes is not None :
+            self._volume_before = cumulative_volumes(sizes, self._volume_before)[-1]
+        self._pending = ( timestamps[:0], prices[:0], None if sizes is None else sizes[:0] )
+
+        return len(starts)
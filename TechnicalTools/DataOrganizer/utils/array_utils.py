@@ -0,0 +1,70 @@
+import numpy as np
+
+
+def readonly_view(array) :
+    """Returns read-only view of 'array' (no copy)."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def as_float_column(values, length=None) :
+    """Returns 'values' as contiguous float64 array.
+    No copy is made if 'values' is already contiguous float64 array.
+    If 'values' is None, NaN filled array of 'length' is returned.
+    """
+    if values is None :
+        return np.full(length, np.nan)
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def as_date_column(values) :
+    """Returns 'values' as datetime64 array if possible, otherwise as object array."""
+    if values is None :
+        return None
+    values = np.asarray(values)
+    if values.dtype.kind == 'M' :
+        return values
+    try :
+        return values.astype('datetime64[ns]')
+    except (TypeError, ValueError) :
+        return values.astype(object)
+
+
+def as_column(values) :
+    """Returns 'values' as numpy array. 'values' can be any iterable, such as generator."""
+    if not hasattr(values, '__len__') :
+        values = list(values)
+    return np.asarray(values)
+
+
+def encode_symbols(symbols) :
+    """Encodes symbols into integer codes.
+
+    Args :
+        symbols : iterable of symbol strings. None is encoded as -1.
+
+    Returns : (codes, table) where table[codes[i]] == symbols[i].
+    """
+    if isinstance(symbols, np.ndarray) and symbols.dtype.kind in 'US' :
+        table, codes = np.unique(symbols, return_inverse=True)
+        return codes.astype(np.int32), tuple(table.tolist())
+
+    table = {}
+    codes = np.fromiter(( -1 if s is None else table.setdefault(s, len(table)) for s in symbols ),
+                        dtype=np.int32)
+    return codes, tuple(table)
+
+
+def decode_symbols(codes, table) :
+    """Decodes integer codes made by 'encode_symbols' into symbol strings."""
+    if len(table) == 0 or np.any(codes < 0) :
+        return np.array(list(table) + [None], dtype=object)[codes]
+    return np.array(table)[codes]
+
+
+def segment_starts(keys) :
+    """Returns start positions of runs of equal consecutive 'keys'."""
+    if len(keys) == 0 :
+        return np.array([], dtype=np.intp)
+    return np.concatenate(([0], np.flatnonzero(keys[1:] != keys[:-1]) + 1))
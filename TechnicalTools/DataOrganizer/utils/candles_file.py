@@ -0,0 +1,82 @@
+"""Binary file format of 'Candles' columns.
+
+Layout :
+    magic        : 8 bytes, b'TTCNDL01'
+    header size  : 8 bytes, little endian unsigned integer
+    header       : utf-8 json, { 'length' : n, 'columns' : [ { 'name', 'dtype', 'offset' }, ... ], 'attrs' : {...} }
+    column data  : raw column arrays, each starts at 'offset' aligned to 64 bytes.
+"""
+import json
+import numpy as np
+
+MAGIC = b'TTCNDL01'
+ALIGNMENT = 64
+
+
+def _aligned(offset) :
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def save_columns(path, columns, attrs=None) :
+    """Writes column arrays to 'path'.
+
+    Args :
+        path : file path.
+        columns : dict of column name -> 1-d numpy array (None columns are skipped).
+        attrs : json serializable dict stored in header. (optional)
+    """
+
+    columns = { name : np.ascontiguousarray(column) for name, column in columns.items() if column is not None }
+    lengths = set( len(column) for column in columns.values() )
+    if len(lengths) > 1 :
+        raise Exception("columns have different lengths : {}.".format(lengths))
+    n = lengths.pop() if lengths else 0
+
+    for name, column in columns.items() :
+        if column.dtype.hasobject :
+            raise Exception("column '{}' has object dtype, which can not be saved.".format(name))
+
+    def build_header(data_start) :
+        offset, specs = data_start, []
+        for name, column in columns.items() :
+            specs.append({ 'name' : name, 'dtype' : column.dtype.str, 'offset' : offset })
+            offset = _aligned(offset + column.nbytes)
+        return json.dumps({ 'length' : n, 'columns' : specs, 'attrs' : attrs or {} }).encode('utf-8')
+
+    # header size depends on offsets, so offsets are fixed with padded header size.
+    header = build_header(0)
+    data_start = _aligned(len(MAGIC) + 8 + len(header) + 32 * len(columns))
+    header = build_header(data_start).ljust(data_start - len(MAGIC) - 8)
+
+    with open(path, 'wb') as f :
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).astype('<u8').tobytes())
+        f.write(header)
+        for name, column in columns.items() :
+            f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
+            f.write(memoryview(column.view(np.uint8)))
+
+
+def open_columns(path) :
+    """Opens column arrays of 'path' as read-only memory-mapped arrays (no read into memory).
+
+    Returns : ( dict of column name -> memory-mapped array, attrs dict stored in header )
+    """
+
+    mm = np.memmap(path, dtype=np.uint8, mode='r')
+
+    if bytes(mm[:len(MAGIC)]) != MAGIC :
+        raise Exception("'{}' is not a candles file.".format(path))
+
+    header_size = int(mm[len(MAGIC):len(MAGIC)+8].view('<u8')[0])
+    header_start = len(MAGIC) + 8
+    header = json.loads(bytes(mm[header_start:header_start+header_size]).decode('utf-8'))
+
+    n = header['length']
+    columns = {}
+    for spec in header['columns'] :
+        dtype = np.dtype(spec['dtype'])
+        offset = spec['offset']
+        columns[spec['name']] = mm[offset:offset+n*dtype.itemsize].view(dtype)
+
+    return columns, header.get('attrs', {})
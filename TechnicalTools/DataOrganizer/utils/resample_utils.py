@@ -0,0 +1,138 @@
+import re
+import numpy as np
+
+
+# unit aliases of period rule -> numpy datetime unit. ( 'W' is handled separately. )
+PERIOD_UNITS = {
+    's'   : 's', 'S'  : 's',
+    'min' : 'm', 'T'  : 'm',
+    'h'   : 'h', 'H'  : 'h',
+    'D'   : 'D',
+    'W'   : 'W',
+    'M'   : 'M', 'MS' : 'M',
+    'Y'   : 'Y', 'YS' : 'Y', 'A' : 'Y', 'AS' : 'Y',
+}
+
+# 1970-01-01 is thursday, so weeks are shifted by 3 days to start on monday.
+WEEK_SHIFT_DAYS = 3
+
+
+def parse_period(rule) :
+    """Parses period rule like '5min', '1h', 'D', 'W' or 'M'.
+
+    Returns : (count, unit)
+    """
+    m = re.fullmatch(r'\s*(\d*)\s*([A-Za-z]+)\s*', rule)
+    if m is None or m.group(2) not in PERIOD_UNITS :
+        raise Exception("invalid period rule : '{}'.".format(rule))
+    count = int(m.group(1)) if m.group(1) else 1
+    if count < 1 :
+        raise Exception("invalid period rule : '{}'.".format(rule))
+    return count, PERIOD_UNITS[m.group(2)]
+
+
+def period_keys(dates, rule) :
+    """Returns period number of each date and start date of each period number.
+
+    Args :
+        dates : datetime64 array.
+        rule : period rule. see 'parse_period'.
+
+    Returns : (keys, func) where func(keys) returns start dates of periods as dtype of 'dates'.
+    """
+    count, unit = parse_period(rule)
+
+    if unit == 'W' :
+        days = dates.astype('datetime64[D]').astype(np.int64) + WEEK_SHIFT_DAYS
+        keys = days // (7 * count)
+        to_dates = lambda k : ( k * 7 * count - WEEK_SHIFT_DAYS ).astype('datetime64[D]').astype(dates.dtype)
+    else :
+        keys = dates.astype('datetime64[{}]'.format(unit)).astype(np.int64) // count
+        to_dates = lambda k : ( k * count ).astype('datetime64[{}]'.format(unit)).astype(dates.dtype)
+
+    return keys, to_dates
+
+
+def aggregate_ohlcv(starts, opens, highs, lows, closes, volumes) :
+    """Aggregates OHLCV values over segments starting at 'starts'.
+    NaN prices are ignored for high and low.
+
+    Returns : (opens, highs, lows, closes, volumes) of segments.
+    """
+    if len(starts) == 0 :
+        empty = np.array([], dtype=np.float64)
+        return empty, empty, empty, empty, empty
+
+    ends = np.append(starts[1:], len(opens)) - 1
+    return ( opens[starts],
+             np.fmax.reduceat(highs, starts),
+             np.fmin.reduceat(lows, starts),
+             closes[ends],
+             np.add.reduceat(volumes, starts) )
+
+
+def as_tick_arrays(timestamps, prices, sizes=None) :
+    """Returns tick data as (datetime64 timestamps, float64 prices, float64 sizes or None)."""
+    timestamps = np.asarray(timestamps)
+    if timestamps.dtype.kind != 'M' :
+        timestamps = timestamps.astype('datetime64[ns]')
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if sizes is not None :
+        sizes = np.ascontiguousarray(sizes, dtype=np.float64)
+    if len(prices) != len(timestamps) or ( sizes is not None and len(sizes) != len(timestamps) ) :
+        raise Exception("lengths of 'timestamps', 'prices' and 'sizes' must be the same.")
+    if np.any(timestamps[1:] < timestamps[:-1]) :
+        raise Exception("'timestamps' must be sorted.")
+    return timestamps, prices, sizes
+
+
+def cumulative_volumes(sizes, volume_before=0.) :
+    """Returns total size after each tick, summed one by one from 'volume_before'.
+    Totals are the same however ticks are split into batches, as long as 'volume_before'
+    is the last total of the previous batch.
+    """
+    return np.cumsum(np.concatenate(( [volume_before], sizes )))[1:]
+
+
+def tick_bar_keys(timestamps, sizes, bar, bar_size, count_before=0, volume_before=0.) :
+    """Returns bar number of each tick.
+
+    Args :
+        timestamps : datetime64 array of ticks.
+        sizes : trade sizes of ticks. (required for volume bar)
+        bar : 'time', 'tick' or 'volume'.
+        bar_size : period rule for time bar, number of ticks for tick bar, volume for volume bar.
+        count_before : number of ticks before 'timestamps'. (for tick bar)
+        volume_before : total size of ticks before 'timestamps'. (for volume bar)
+
+    Returns : (keys, ends, func) where 'ends' is the key just after the last tick if the bar
+              of the last tick is completed (otherwise the key of the last bar), and func(keys, starts)
+              returns dates of bars.
+    """
+    n = len(timestamps)
+
+    if bar == 'time' :
+        keys, to_dates = period_keys(timestamps, bar_size)
+        # time bar is completed when a tick of later period arrives.
+        end = keys[-1] if n > 0 else None
+        return keys, end, lambda k, starts : to_dates(k)
+
+    elif bar == 'tick' :
+        if int(bar_size) != bar_size or bar_size < 1 :
+            raise Exception("'bar_size' of tick bar must be positive integer but {}.".format(bar_size))
+        keys = ( count_before + np.arange(n) ) // int(bar_size)
+        end = ( count_before + n ) // int(bar_size)
+
+    elif bar == 'volume' :
+        if sizes is None :
+            raise Exception("'sizes' is required for volume bar.")
+        if not bar_size > 0 :
+            raise Exception("'bar_size' of volume bar must be positive but {}.".format(bar_size))
+        volumes_after = cumulative_volumes(sizes, volume_before)
+        keys = np.floor( ( volumes_after - sizes ) / bar_size ).astype(np.int64)
+        end = int(np.floor( volumes_after[-1] / bar_size )) if n > 0 else None
+
+    else :
+        raise Exception("invalid value for 'bar' : {}.".format(bar))
+
+    return keys, end, lambda k, starts : timestamps[starts]
@@ -1,2 +1,5 @@
 from .localminmax_sampler import LocalMinMaxSampler
+from .swing_strength_index import SwingStrengthIndex
+from .streaming_localminmax_sampler import StreamingLocalMinMaxSampler
 from .convex_sampler import ConvexSampler
+from .convex_sampler_hierarchy import ConvexSamplerHierarchy
@@ -1,60 +1,23 @@
+import heapq
+import numpy as np
 from typing import Literal, Callable
 
-from .. DataOrganizer import DataPoint, DataPoints
-from . utils.sampler_datapoint import SamplerDataPoint
-from . utils.sampler_datapoints import SamplerDataPoints
+from .. DataOrganizer import DataPoints
+from . convex_sampler_hierarchy import ConvexSamplerHierarchy
+from . utils.convexity import calc_convexities, select_non_adjacent
+from . utils.parallel import sample_indices_many
 
 
 
-##################################
-#### CONVEX SAMPLER DATAPOINT ####
-##################################
-
-class ConvexSamplerDataPoint(SamplerDataPoint) :
-                
-    def calc_convexity(self,w,xmin,xmax) :
-        
-        v  = self
-        vl = self.left
-        vr = self.right
-        
-        if vl :
-            dyl = v.y - vl.y
-            dxl = v.x - vl.x
-        else :
-            dyl = 0
-            dxl = 2*( v.x - xmin ) + 1
-            
-        if vr :
-            dyr = vr.y - v.y
-            dxr = vr.x - v.x
-        else :
-            dyr = 0
-            dxr = 2*( xmax - v.x ) + 1
-        
-        if dxl+dxr <= w :
-            self._convexity = ( dyr/dxr - dyl/dxl ) / ( dxl + dxr )
-        else :
-            self._convexity = None
-            
-        return self._convexity
-    
-    @property
-    def convexity(self) :
-        return self._convexity
+def upward_evaluator(convexities, xs, ys) :
+    return convexities > 0
 
 
-        
-###################################
-#### CONVEX SAMPLER DATAPOINTS ####
-###################################
+def downward_evaluator(convexities, xs, ys) :
+    return convexities < 0
 
-class ConvexSamplerDataPoints(SamplerDataPoints) :
 
-    DATA_POINT_CLASS = ConvexSamplerDataPoint
 
-
-        
 ########################
 #### CONVEX SAMPLER ####
 ########################
@@ -69,7 +32,8 @@ class ConvexSampler() :
                  target=Literal['upward','downward','user_defined'],
                  w=10,
                  maxiter=None,
-                 evaluator:Callable=None ) :
+                 evaluator:Callable=None,
+                 mode:Literal['round','greedy']='round' ) :
         """Init and set parameters.
 
         Args :
@@ -83,6 +47,20 @@ class ConvexSampler() :
                       if not set, maxiter will be set to max(1,int(w)).
             evaluator : evaluator function to select datapoints to delete by convexity value, etc.
                         set 'target' arg to 'user_defined' to enable it.
+                        called as evaluator(convexities, xs, ys) with arrays of remaining datapoints,
+                        and must return boolean mask of datapoints to delete.
+                        convexities are NaN where not evaluated, and the mask is ignored there.
+            mode : 'round' or 'greedy'. default='round'.
+                   'round' -- each iteration deletes non-adjacent convex points of the same datapoints,
+                              in descending order of |convexity|.
+                   'greedy' -- deletes the point with the largest |convexity| one by one, and
+                               recomputes convexities of only its neighbors, until no candidate remains.
+                               O(n log n) in total regardless of the number of rounds, and 'maxiter' is not used.
+                               results can differ from 'round' mode.
+                               each deletion is a Python-level heap update, so it is not a fast path :
+                               it is 3x to 13x slower than 'round' mode (i.e. ~0.6s vs ~0.06s for 10^5 points,
+                               see benchmarks/bench_convex_sampler.py), and not faster than the previous per-point loop.
+                               use it only when the one-by-one deletion order is needed.
         """
         self._w = w
 
@@ -92,10 +70,14 @@ class ConvexSampler() :
 
         self._target = target
 
+        if mode not in ('round','greedy') :
+            raise Exception("invalid value for 'mode' : {}.".format(mode))
+        self._mode = mode
+
         if target == 'upward' :
-            self._evaluator = lambda dp:dp.convexity>0
+            self._evaluator = upward_evaluator
         elif target == 'downward' :
-            self._evaluator = lambda dp:dp.convexity<0
+            self._evaluator = downward_evaluator
         elif target == 'user_defined':
             if evaluator is None :
                 raise Exception("variable 'target' == \"user_defined\" but variable 'evaluator' is not set.")
@@ -112,6 +94,7 @@ class ConvexSampler() :
             'w' : self._w,
             'maxiter' : self._maxiter,
             'target' : self._target,
+            'mode' : self._mode,
         }
 
         if self._target == 'user_defined' :
@@ -120,37 +103,175 @@ class ConvexSampler() :
         return params
 
 
-    def _delete_convexes(self,sdps) :
-        
-        xmin,xmax = sdps.xs[[0,-1]]
+    def _delete_convexes(self, xs, ys, live, xmin, xmax) :
+        """Deletes convex points once from 'live' positions.
+        Returns remaining positions and deleted positions in order of deletion.
+        """
+
+        live_xs, live_ys = xs[live], ys[live]
+        convexities, valid = calc_convexities(live_xs, live_ys, self._w, xmin, xmax)
+
+        candidates = valid & ( convexities != 0 )
+        candidates &= np.asarray(self._evaluator(convexities, live_xs, live_ys), dtype=bool)
+
+        priorities = np.abs(convexities)
+        to_delete = select_non_adjacent(candidates, priorities)
+
+        deleted = np.flatnonzero(to_delete)
+        deleted = deleted[np.argsort(-priorities[deleted], kind='stable')]
+
+        return live[~to_delete], live[deleted]
+
+    
+    def _delete_convexes_greedy(self, xs, ys, xmin, xmax) :
+        """Deletes convex points one by one until no candidate remains.
+        Returns remaining positions and deleted positions in order of deletion.
+        Candidates are kept in a heap keyed by -|convexity| (ties in order of position),
+        and outdated heap entries are skipped when popped.
+        Each deletion costs a heap pop and Python-level updates of its two neighbors,
+        so this is much slower than the vectorized rounds of '_delete_convexes'.
+        """
+
+        n = len(xs)
+        X, Y = xs.tolist(), ys.tolist()
+        xmin, xmax = X[0], X[-1]
+        w = self._w
+        evaluator = self._evaluator
+
+        prev_positions = list(range(-1,n-1))
+        next_positions = list(range(1,n+1))
+        alive = [True]*n
+        deleted = []
+
+        def convexity(i) :
+            l, r = prev_positions[i], next_positions[i]
+            if l >= 0 :
+                dyl, dxl = Y[i] - Y[l], X[i] - X[l]
+            else :
+                dyl, dxl = 0, 2*( X[i] - xmin ) + 1
+            if r < n :
+                dyr, dxr = Y[r] - Y[i], X[r] - X[i]
+            else :
+                dyr, dxr = 0, 2*( xmax - X[i] ) + 1
+
+            if dxl + dxr > w :
+                return None
+            try :
+                return ( dyr/dxr - dyl/dxl ) / ( dxl + dxr )
+            except ZeroDivisionError :
+                return float('nan')
+
+        convexities, valid = calc_convexities(xs, ys, w, xmin, xmax)
+        candidates = valid & ( convexities != 0 )
+        candidates &= np.asarray(evaluator(convexities, xs, ys), dtype=bool)
+
+        keys = np.where(candidates, -np.abs(convexities), np.nan).tolist()
+        heap = [ ( keys[i], i ) for i in np.flatnonzero(candidates).tolist() ]
+        heapq.heapify(heap)
+
+        sign = 1 if evaluator is upward_evaluator else -1 if evaluator is downward_evaluator else 0
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        while heap :
+            key, i = heappop(heap)
+            if keys[i] != key :
+                continue
+
+            alive[i] = False
+            keys[i] = None
+            deleted.append(i)
+            l, r = prev_positions[i], next_positions[i]
+            if l >= 0 :
+                next_positions[l] = r
+            if r < n :
+                prev_positions[r] = l
+
+            if sign != 0 :
+                for j in ( l, r ) :
+                    if 0 <= j < n :
+                        v = convexity(j)
+                        if v is not None and v*sign > 0 :
+                            keys[j] = -abs(v)
+                            heappush(heap, ( keys[j], j ))
+                        else :
+                            keys[j] = None
+                continue
+
+            neighbors = [ j for j in (l,r) if 0 <= j < n ]
+            values = [ convexity(j) for j in neighbors ]
+            evaluated = np.array([ np.nan if v is None else v for v in values ])
+            mask = np.asarray(evaluator(evaluated, np.array([ X[j] for j in neighbors ]),
+                                        np.array([ Y[j] for j in neighbors ])), dtype=bool)
+
+            for j, v, m in zip(neighbors, values, mask) :
+                if v is not None and v != 0 and m :
+                    keys[j] = -abs(v)
+                    heappush(heap, ( keys[j], j ))
+                else :
+                    keys[j] = None
+
+        return np.flatnonzero(alive), np.array(deleted, dtype=np.intp)
+
+
+    def _delete_rounds(self, xs, ys, maxiter) :
+        """Returns remaining positions and list of deleted positions of each round.
+        'greedy' mode deletes in a single round.
+        """
+
+        live = np.arange(len(xs))
+        if len(live) == 0 :
+            return live, []
+
+        xmin, xmax = xs[[0,-1]]
+
+        if self._mode == 'greedy' :
+            live, deleted = self._delete_convexes_greedy(xs, ys, xmin, xmax)
+            return live, [deleted] if len(deleted) > 0 else []
+
+        rounds = []
+        while maxiter is None or len(rounds) < maxiter :
+            live, deleted = self._delete_convexes(xs, ys, live, xmin, xmax)
+            if len(deleted) == 0 :
+                break
+            rounds.append(deleted)
+
+        return live, rounds
+
+
+    def sample_indices(self, data:DataPoints ) :
+        """Returns positions of sampled datapoints in 'data', using convex sampling method
+        ( iteratively deletes convexed points ).
+        Remaining datapoints are kept as array of positions, and each iteration computes
+        convexities of all remaining datapoints at once.
         
-        def enclosure() :
-            
-            to_delete = []
-            for dp in sdps :
-                dp.calc_convexity(self._w,xmin,xmax) 
-                if dp.convexity and self._evaluator(dp) :
-                    to_delete.append(dp)
+        Args :
+            data : 'DataPoints' objects.
 
-            to_delete.sort(key=lambda dp:abs(dp.convexity),reverse=True)
+        Returns : integer array.
+        """
+
+        if not isinstance(data,DataPoints) :
+            data = DataPoints(data)
 
-            cnt = 0
-            for dp in to_delete :
-                if ( dp.left and dp.left.deleted ) or (dp.right and dp.right.deleted ) :
-                    continue
-                dp.delete()
-                cnt += 1
+        live, _ = self._delete_rounds(data.xs, data.ys, self._maxiter)
 
-            sdps.update()
+        return live
 
-            return cnt
-       
- 
-        return enclosure
+
+    def sample_mask(self, data:DataPoints ) :
+        """Returns boolean mask of sampled datapoints in 'data'. see 'sample_indices'.
+
+        Returns : boolean array.
+        """
+
+        mask = np.zeros(len(data), dtype=bool)
+        mask[self.sample_indices(data)] = True
+        return mask
 
     
     def sample(self, data:DataPoints ) :
         """Returns sampled datapoints using convex sampling method ( iteratively deletes convexed points )
+        Sampled datapoints are gathered from column arrays of 'data', without creating 'DataPoint' objects.
         
         Args :
             data : 'DataPoints' objects.
@@ -158,12 +279,60 @@ class ConvexSampler() :
         Returns : 'DataPoints' objects.
         """
 
-        sdps = ConvexSamplerDataPoints.create_from_data_points(data)
-        delete_convexes = self._delete_convexes(sdps)
-
-        for i in range(self._maxiter) :
-            cnt = delete_convexes()
-            if cnt == 0 :
-                break
+        if not isinstance(data,DataPoints) :
+            data = DataPoints(data)
             
-        return DataPoints([ DataPoint(dp.x,dp.y,index=dp.index,symbol=dp.symbol) for dp in sdps ])
+        return data._take(self.sample_indices(data), cls=DataPoints)
+
+
+    def create_hierarchy(self, data:DataPoints ) :
+        """Runs deletion until no point is deleted (ignoring 'maxiter') and records
+        the round and order at which each datapoint is deleted.
+        Sampled datapoints for any 'maxiter' or number of points are then queried from
+        the returned object without rerunning. (see 'ConvexSamplerHierarchy')
+        In 'greedy' mode, all datapoints are deleted in a single round, so only number of points
+        can be queried.
+
+        Args :
+            data : 'DataPoints' objects.
+
+        Returns : 'ConvexSamplerHierarchy' objects.
+        """
+
+        if not isinstance(data,DataPoints) :
+            data = DataPoints(data)
+
+        live, rounds = self._delete_rounds(data.xs, data.ys, None)
+
+        n = len(data)
+        levels = np.full(n, np.inf)
+        for level, deleted in enumerate(rounds, start=1) :
+            levels[deleted] = level
+
+        orders = np.empty(n, dtype=np.int64)
+        orders[np.concatenate(rounds + [live]).astype(np.intp)] = np.arange(n)
+
+        params = self.params
+        params.pop('maxiter')
+        params.pop('evaluator_function', None)
+
+        return ConvexSamplerHierarchy(data, levels, orders, params)
+
+
+    def sample_many(self, list_of_datapoints, workers=None, chunksize=8) :
+        """Samples many series with process pool. Results are the same as 'sample' of each series.
+        'evaluator' must be picklable (i.e. module-level function) to use worker processes.
+
+        Args :
+            list_of_datapoints : list of 'DataPoints' objects.
+            workers : number of worker processes. (optional, if not set, number of CPUs.)
+                      if 1, runs sequentially in this process.
+            chunksize : number of series sent to a worker at once. default=8.
+
+        Returns : list of 'DataPoints' objects, in order of input.
+        """
+
+        list_of_datapoints = [ dps if isinstance(dps,DataPoints) else DataPoints(dps) for dps in list_of_datapoints ]
+        list_of_indices = sample_indices_many(self, list_of_datapoints, workers=workers, chunksize=chunksize)
+
+        return [ dps._take(indices, cls=DataPoints) for dps, indices in zip(list_of_datapoints, list_of_indices) ]
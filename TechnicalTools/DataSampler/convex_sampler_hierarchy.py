@@ -0,0 +1,152 @@
+import json
+import numpy as np
+
+from .. DataOrganizer import DataPoints
+from .. DataOrganizer.utils.array_utils import readonly_view
+
+
+
+##################################
+#### CONVEX SAMPLER HIERARCHY ####
+##################################
+
+class ConvexSamplerHierarchy() :
+    """Simplification hierarchy recorded by 'ConvexSampler.create_hierarchy'.
+    Holds the round ('level') and the order at which each datapoint is deleted, so that
+      - sample(level=k) is the same as sampling with maxiter=k,
+      - sample(n_points=m) keeps the m datapoints deleted last.
+    Both are mask queries over stored arrays. Hierarchy can be saved and loaded with its datapoints.
+    Hierarchies of 'greedy' mode delete all datapoints in a single round, so only 'n_points' queries
+    are supported for them.
+    """
+
+    def __init__(self, data:DataPoints, levels, orders, params) :
+        """Init.
+
+        Args :
+            data : 'DataPoints' objects sampled.
+            levels : deletion round of each datapoint, starting from 1. (inf if never deleted)
+            orders : deletion order of each datapoint. datapoints never deleted follow in order of position.
+            params : params of 'ConvexSampler'.
+        """
+
+        if not len(data) == len(levels) == len(orders) :
+            raise Exception("length of 'levels' and 'orders' must be the same as 'data'.")
+
+        self._data = data
+        self._levels = np.asarray(levels, dtype=np.float64)
+        self._orders = np.asarray(orders, dtype=np.int64)
+        self._params = dict(params)
+
+
+    def __len__(self) :
+        return len(self._levels)
+
+
+    @property
+    def params(self) :
+        return dict(self._params)
+
+
+    @property
+    def datapoints(self) :
+        return self._data
+
+
+    @property
+    def levels(self) :
+        """deletion round of each datapoint. (inf if never deleted)"""
+        return readonly_view(self._levels)
+
+
+    @property
+    def orders(self) :
+        """deletion order of each datapoint."""
+        return readonly_view(self._orders)
+
+
+    @property
+    def max_level(self) :
+        """number of rounds until no datapoint is deleted."""
+        finite = self._levels[np.isfinite(self._levels)]
+        return int(finite.max()) if len(finite) > 0 else 0
+
+
+    def mask(self, level=None, n_points=None) :
+        """Returns boolean mask of sampled datapoints.
+
+        Args :
+            level : number of deletion rounds. (i.e. 'maxiter')
+            n_points : number of datapoints to keep. must not be less than the number of
+                       datapoints never deleted, since they have no deletion order.
+            if neither is set, datapoints remaining after all rounds.
+        """
+
+        if level is not None and n_points is not None :
+            raise Exception("set either 'level' or 'n_points', not both.")
+
+        if n_points is not None :
+            n_survivors = int(np.isinf(self._levels).sum())
+            if n_points < n_survivors :
+                raise Exception("'n_points' must not be less than the number of datapoints never deleted : {} < {}."
+                                .format(n_points, n_survivors))
+            return self._orders >= len(self) - n_points
+        if level is not None and self._params.get('mode') == 'greedy' :
+            raise Exception("'level' is not supported for hierarchy of 'greedy' mode. use 'n_points'.")
+        if level is None :
+            return np.isinf(self._levels)
+        return self._levels > level
+
+
+    def sample(self, level=None, n_points=None) :
+        """Returns sampled datapoints. see 'mask' for args.
+
+        Returns : 'DataPoints' objects.
+        """
+        return self._data._take(self.mask(level=level, n_points=n_points), cls=DataPoints)
+
+
+    def save(self, path) :
+        """Saves hierarchy and its datapoints into npz file.
+        Symbols are saved as strings, and object-typed indices are not supported.
+        """
+
+        columns = self._data._columns
+        arrays = {
+            'x'       : columns['x'],
+            'y'       : columns['y'],
+            'symbol'  : columns['symbol'],
+            'symbol_table' : np.array([ str(s) for s in self._data._symbol_table ], dtype=str),
+            'levels'  : self._levels,
+            'orders'  : self._orders,
+            'params'  : np.array(json.dumps(self._params)),
+        }
+
+        if columns['index'] is not None :
+            if columns['index'].dtype == object :
+                raise Exception("object-typed indices can not be saved.")
+            arrays['index'] = columns['index']
+
+        with open(path, 'wb') as f :
+            np.savez(f, **arrays)
+
+
+    @classmethod
+    def load(cls, path) :
+        """Loads hierarchy saved by 'save'.
+
+        Returns : 'ConvexSamplerHierarchy' objects.
+        """
+
+        with np.load(path, allow_pickle=False) as f :
+            arrays = { name : f[name] for name in f.files }
+
+        columns = {
+            'x'      : arrays['x'],
+            'y'      : arrays['y'],
+            'index'  : arrays.get('index'),
+            'symbol' : arrays['symbol'],
+        }
+        data = DataPoints._create_from_columns(columns, tuple(arrays['symbol_table'].tolist()))
+
+        return cls(data, arrays['levels'], arrays['orders'], json.loads(str(arrays['params'])))
@@ -1,77 +1,16 @@
-from typing import Literal
+import numpy as np
+from typing import Literal, Optional
 
-from .. DataOrganizer import DataPoint,DataPoints
-from . utils.sampler_datapoint import SamplerDataPoint
-from . utils.sampler_datapoints import SamplerDataPoints
+from .. DataOrganizer import DataPoints
+from . swing_strength_index import SwingStrengthIndex
+from . utils.parallel import sample_indices_many
+from . utils.sliding_window import window_bounds, local_extrema_mask
 
 
 
-##########################################
-#### LOCAL MIN MAX SAMPLER DATA POINT ####
-##########################################
-
-class LocalMinMaxSamplerDataPoint(SamplerDataPoint) :
-    
-    
-    def _get_neighbors(self, d) :
-        
-        neighbors = [self]
-        
-        v = self
-        while True :
-            v = v.left
-            if v is None or self.x - v.x > d :
-                break
-                
-            neighbors.append(v)
-            
-        v = self
-        while True :
-            v = v.right
-            if v is None or v.x - self.x > d :
-                break
-            
-            neighbors.append(v)
-
-        return neighbors
-    
-    
-    def is_localmin(self, d) :
-        
-        neighbors = self._get_neighbors(d)
-        dp_localmin, *_ = sorted(neighbors, key=lambda dp:dp.y, reverse=False)
-        
-        if self is dp_localmin :
-            return True
-        else :
-            return False
- 
-
-    def is_localmax(self, d) :
-        
-        neighbors = self._get_neighbors(d)
-        dp_localmax, *_ = sorted(neighbors, key=lambda dp:dp.y, reverse=True)
-        
-        if self is dp_localmax :
-            return True
-        else :
-            return False
-
-
-
-###########################################
-#### LOCAL MIN MAX SAMPLER DATA POINTS ####
-###########################################
-
-class LocalMinMaxSamplerDataPoints(SamplerDataPoints) :
-    
-    DATA_POINT_CLASS = LocalMinMaxSamplerDataPoint            
-
-
-
-##########################################
-#### LOCAL MIN MAX SAMPLER DATA POINT ####
-##########################################
+###############################
+#### LOCAL MIN MAX SAMPLER ####
+###############################
 
 class LocalMinMaxSampler() :
     """Data Sampler using local min/max method. (swing low/high method)
@@ -98,23 +37,114 @@ class LocalMinMaxSampler() :
         }
 
     
-    def sample(self, data:DataPoints ) :
-        """Returns sampled datapoints using local min/max (also called as swing high/low) method.
+    def create_index(self, data:DataPoints) :
+        """Returns 'SwingStrengthIndex' object of 'data' for this sampler's method.
+        Pass it to 'sample' to sample with any 'd' without recomputing window min/max.
+        """
+        return SwingStrengthIndex(data, self._method)
+
+
+    def sample_mask(self, data:DataPoints, index:Optional[SwingStrengthIndex]=None ) :
+        """Returns boolean mask of sampled datapoints in 'data'.
+        A datapoint is sampled if its y-value is the min/max among datapoints within 'd'-distance,
+        i.e. tied datapoints are all sampled.
+        Window min/max is computed on arrays with sliding window kernel. (see 'utils.sliding_window')
         
         Args :
-            data : 'DataPoints' objects.
+            data : 'DataPoints' objects. datapoints must be ordered by x.
+            index : 'SwingStrengthIndex' object of 'data'. (optional, see 'create_index')
+            
+        Returns : boolean array.
+        """
+
+        if not isinstance(data,DataPoints) :
+            data = DataPoints(data)
+
+        if index is not None :
+            if index.params['method'] != self.params['method'] or len(index) != len(data) :
+                raise Exception("'index' is not built for this sampler and 'data'.")
+            return index.mask(self._d)
+
+        return local_extrema_mask(data.xs, data.ys, self._d, self._method)
+
+
+    def sample_indices(self, data:DataPoints, index:Optional[SwingStrengthIndex]=None ) :
+        """Returns positions of sampled datapoints in 'data'. see 'sample_mask' for args.
+
+        Returns : integer array.
+        """
+        return np.flatnonzero(self.sample_mask(data, index=index))
+
+
+    def sample(self, data:DataPoints, index:Optional[SwingStrengthIndex]=None ) :
+        """Returns sampled datapoints using local min/max (also called as swing high/low) method.
+        Sampled datapoints are gathered from column arrays of 'data', without creating 'DataPoint' objects.
+        see 'sample_mask' for args.
             
         Returns : 'DataPoints' objects.
         """
     
-        lmmdps = LocalMinMaxSamplerDataPoints.create_from_data_points(data)
-        
-        sampled_dps = []
-        for dp in lmmdps :
-            if ( self._method == 'min' and dp.is_localmin(self._d) ) \
-                or (self._method == 'max' and dp.is_localmax(self._d) ) :
-                sampled_dps.append(dp)
+        if not isinstance(data,DataPoints) :
+            data = DataPoints(data)
 
-        return DataPoints([ DataPoint(dp.x,dp.y,index=dp.index,symbol=dp.symbol) for dp in sampled_dps])
-        
-        
+        return data._take(self.sample_mask(data, index=index), cls=DataPoints)
+
+
+    def sample_chunked(self, ys, xs=None, block_size=1000000, indices=None, symbol=None) :
+        """Samples long series block by block, and yields sampled datapoints of each block.
+        Each block is evaluated with the datapoints within 'd'-distance beyond its boundaries,
+        so results are the same as 'sample' over the whole series.
+        Arrays can be memory-mapped (i.e. np.memmap, np.load(mmap_mode='r')), and only
+        a block and its overlap are read into memory at once.
+
+        Args :
+            ys : y-coordinate values.
+            xs : x-coordinate values, must be sorted. (optional, if not set, positions 0,1,2,... are used.)
+            block_size : number of datapoints evaluated at once. default=1000000.
+            indices : index values. (optional)
+            symbol : symbol string of datapoints. (optional)
+
+        Yields : 'DataPoints' objects of sampled datapoints of each block. empty blocks are skipped.
+        """
+
+        n = len(ys)
+        d = self._d
+
+        for start in range(0, n, block_size) :
+            stop = min(start + block_size, n)
+
+            if xs is None :
+                k = int(np.floor(d))
+                lo, hi = max(start - k, 0), min(stop + k, n)
+                block_xs = np.arange(lo, hi)
+            else :
+                los, his = window_bounds(xs, d, positions=[start, stop-1])
+                lo, hi = int(los[0]), int(his[1])
+                block_xs = np.asarray(xs[lo:hi])
+
+            mask = local_extrema_mask(block_xs, ys[lo:hi], d, self._method)[start-lo:stop-lo]
+            positions = np.flatnonzero(mask)
+            if len(positions) == 0 :
+                continue
+
+            yield DataPoints.create_from_xsys(block_xs[positions + start - lo], ys[positions + start],
+                                              indices=None if indices is None else indices[positions + start],
+                                              symbols=None if symbol is None else [symbol]*len(positions))
+
+
+    def sample_many(self, list_of_datapoints, workers=None, chunksize=8) :
+        """Samples many series with process pool. Results are the same as 'sample' of each series.
+
+        Args :
+            list_of_datapoints : list of 'DataPoints' objects.
+            workers : number of worker processes. (optional, if not set, number of CPUs.)
+                      if 1, runs sequentially in this process.
+            chunksize : number of series sent to a worker at once. default=8.
+
+        Returns : list of 'DataPoints' objects, in order of input.
+        """
+
+        list_of_datapoints = [ dps if isinstance(dps,DataPoints) else DataPoints(dps) for dps in list_of_datapoints ]
+        list_of_indices = sample_indices_many(self, list_of_datapoints, workers=workers, chunksize=chunksize)
+
+        return [ dps._take(indices, cls=DataPoints) for dps, indices in zip(list_of_datapoints, list_of_indices) ]
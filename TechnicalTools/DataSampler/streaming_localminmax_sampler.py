@@ -0,0 +1,111 @@
+from collections import deque
+from typing import Literal
+
+from .. DataOrganizer import DataPoint, DataPoints
+from . utils.sliding_window import beyond_distance
+
+
+
+#########################################
+#### STREAMING LOCAL MIN MAX SAMPLER ####
+#########################################
+
+class StreamingLocalMinMaxSampler() :
+    """Online form of 'LocalMinMaxSampler'.
+    Datapoints are pushed one by one, and a local min/max datapoint is returned as soon as it is
+    confirmed, i.e. when a datapoint beyond 'd'-distance to the right arrives.
+    Datapoints returned over a full series are the same as 'LocalMinMaxSampler(method,d).sample'.
+
+    Only the datapoints within the last 'd'-distance are kept :
+      - window : datapoints with increasing y-values (for 'min'), whose front is the window min.
+      - pending : candidates with no smaller datapoint on the left, waiting for confirmation.
+                  pending candidates are within 'd'-distance of each other, so they have the same y-value.
+    Each push costs O(1) amortized.
+    """
+
+    def __init__(self, method:Literal['min','max'], d=6) :
+        """Init and set parameters.
+
+        Args :
+            method : 'min' or 'max', for sampling only local 'min' or 'max' data points.
+            d : evaluate if a datapoint is local min/max among left and right neighbors within 'd'-distance.
+                default=6.
+        """
+
+        if method == 'min' :
+            self._sign = 1
+        elif method == 'max' :
+            self._sign = -1
+        else :
+            raise Exception("invalid value for 'method' : {}.".format(method))
+
+        self._method = method
+        self._d = d
+
+        self._window  = deque()
+        self._pending = deque()
+        self._last_x  = None
+
+
+    @property
+    def params(self) :
+        return {
+            'method' : 'local_{}'.format(self._method),
+            'd' : self._d
+        }
+
+
+    @property
+    def pending(self) :
+        """candidate datapoints waiting for confirmation."""
+        return DataPoints([ dp for _, dp in self._pending ])
+
+
+    def push(self, x, y, index=None, symbol=None) :
+        """Pushes a datapoint and returns datapoints confirmed as local min/max.
+
+        Args :
+            x : x-coordinate value. must not be less than pushed values.
+            y : y-coordinate value.
+            index : index value. (optional)
+            symbol : symbol string. (optional)
+
+        Returns : list of 'DataPoint' objects.
+        """
+
+        if self._last_x is not None and x < self._last_x :
+            raise Exception("'x' must not be less than pushed values : {} < {}.".format(x, self._last_x))
+        self._last_x = x
+
+        d = self._d
+        key = self._sign * y
+
+        # candidates without datapoint within 'd'-distance on the right are confirmed.
+        confirmed = []
+        while self._pending and beyond_distance(x - self._pending[0][1].x, d) :
+            confirmed.append(self._pending.popleft()[1])
+
+        # remaining candidates are within 'd'-distance, and all are rejected by a smaller value.
+        if self._pending and key < self._pending[0][0] :
+            self._pending.clear()
+
+        while self._window and beyond_distance(x - self._window[0][1], d) :
+            self._window.popleft()
+        if not self._window or self._window[0][0] >= key :
+            self._pending.append(( key, DataPoint(x, y, index=index, symbol=symbol) ))
+
+        while self._window and self._window[-1][0] >= key :
+            self._window.pop()
+        self._window.append(( key, x ))
+
+        return confirmed
+
+
+    def flush(self) :
+        """Confirms remaining candidates, i.e. at the end of series.
+
+        Returns : list of 'DataPoint' objects.
+        """
+        confirmed = [ dp for _, dp in self._pending ]
+        self._pending.clear()
+        return confirmed
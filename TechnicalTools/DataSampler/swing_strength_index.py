@@ -0,0 +1,83 @@
+import numpy as np
+from typing import Literal
+
+from .. DataOrganizer import DataPoints
+from . utils.sliding_window import beyond_distance, swing_strengths
+
+
+
+##############################
+#### SWING STRENGTH INDEX ####
+##############################
+
+class SwingStrengthIndex() :
+    """Precomputed swing strength of datapoints, for sampling with many 'd' values.
+    Swing strength of a datapoint is the x-distance to the nearest datapoint with strictly smaller
+    (local min) or larger (local max) y-value, so the datapoint is local min/max within 'd'-distance
+    if and only if its strength is greater than 'd'.
+    Sampling with any 'd' is a threshold mask, and gives the same result as 'LocalMinMaxSampler(method,d).sample(data)'.
+    """
+
+    def __init__(self, data:DataPoints, method:Literal['min','max']) :
+        """Init and compute swing strengths.
+
+        Args :
+            data : 'DataPoints' objects. datapoints must be ordered by x.
+            method : 'min' or 'max', for local 'min' or 'max' data points.
+        """
+
+        if not isinstance(data,DataPoints) :
+            data = DataPoints(data)
+
+        self._data = data
+        self._method = method
+        self._strengths = swing_strengths(data.xs, data.ys, method)
+        self._strengths.flags.writeable = False
+        self._sorted_strengths = None
+
+
+    def __len__(self) :
+        return len(self._strengths)
+
+
+    @property
+    def params(self) :
+        return {
+            'method' : 'local_{}'.format(self._method),
+        }
+
+
+    @property
+    def datapoints(self) :
+        return self._data
+
+
+    @property
+    def strengths(self) :
+        """swing strength of each datapoint. (inf for global min/max)"""
+        return self._strengths
+
+
+    def mask(self, d) :
+        """Returns boolean mask of local min/max datapoints within 'd'-distance."""
+        return beyond_distance(self._strengths, d)
+
+
+    def count(self, d) :
+        """Returns number of local min/max datapoints within 'd'-distance.
+        'd' can be array-like, to count for many 'd' values at once.
+        """
+        if self._sorted_strengths is None :
+            self._sorted_strengths = np.sort(self._strengths)
+        return len(self) - np.searchsorted(self._sorted_strengths, d, side='right')
+
+
+    def sample(self, d) :
+        """Returns local min/max datapoints within 'd'-distance.
+
+        Args :
+            d : distance to evaluate local min/max.
+
+        Returns : 'DataPoints' objects.
+        """
+        return self._data._take(self.mask(d), cls=DataPoints)
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def calc_convexities(xs, ys, w, xmin, xmax) :
+    """Returns convexity of each datapoint with its left and right neighbors, and validity mask.
+    Convexity is evaluated only if the neighbors are less than 'w'-distance (dxl+dxr <= w),
+    otherwise it is NaN. For the first (last) datapoint, missing left (right) neighbor is
+    treated as flat line to 'xmin' ('xmax').
+
+    Args :
+        xs, ys : coordinates of remaining datapoints, ordered by x.
+        w : maximum distance between left and right neighbors.
+        xmin, xmax : x-range of the original datapoints.
+    """
+
+    xs = np.asarray(xs)
+    ys = np.asarray(ys)
+    n = len(xs)
+
+    dxl = np.empty(n, dtype=np.float64)
+    dyl = np.empty(n, dtype=np.float64)
+    dxr = np.empty(n, dtype=np.float64)
+    dyr = np.empty(n, dtype=np.float64)
+
+    if n > 0 :
+        dxl[1:] = dxr[:-1] = xs[1:] - xs[:-1]
+        dyl[1:] = dyr[:-1] = ys[1:] - ys[:-1]
+        dxl[0], dyl[0] = 2*( xs[0] - xmin ) + 1, 0
+        dxr[-1], dyr[-1] = 2*( xmax - xs[-1] ) + 1, 0
+
+    valid = dxl + dxr <= w
+
+    with np.errstate(divide='ignore', invalid='ignore') :
+        convexities = np.where(valid, ( dyr/dxr - dyl/dxl ) / ( dxl + dxr ), np.nan)
+
+    return convexities, valid
+
+
+def select_non_adjacent(candidates, priorities) :
+    """Returns boolean mask of datapoints to delete. Candidates are visited in descending order
+    of 'priorities' (ties in order of position), and a candidate is deleted unless its left or right
+    neighbor is already deleted. The greedy result is computed with array masks :
+
+        - a candidate with no higher-priority candidate neighbor (peak) is deleted.
+        - a candidate with one higher-priority neighbor is on a slope to a peak,
+          and is deleted if its distance to the peak is even.
+        - a candidate with two higher-priority neighbors (valley) is deleted if neither neighbor is deleted.
+
+    Args :
+        candidates : boolean mask of candidates.
+        priorities : priority of each datapoint.
+    """
+
+    candidates = np.asarray(candidates, dtype=bool)
+    n = len(candidates)
+    positions = np.arange(n)
+
+    ranks = np.empty(n, dtype=np.intp)
+    ranks[np.argsort(-np.where(candidates, priorities, -np.inf), kind='stable')] = positions
+
+    pairs = candidates[:-1] & candidates[1:]
+    higher_left  = np.zeros(n, dtype=bool)
+    higher_right = np.zeros(n, dtype=bool)
+    higher_left[1:]   = pairs & ( ranks[:-1] < ranks[1:] )
+    higher_right[:-1] = pairs & ( ranks[1:] < ranks[:-1] )
+
+    peak_left  = np.maximum.accumulate(np.where(higher_left, 0, positions))
+    peak_right = np.minimum.accumulate(np.where(higher_right, n, positions)[::-1])[::-1]
+
+    slope_left  = higher_left & ~higher_right
+    slope_right = higher_right & ~higher_left
+
+    to_delete = candidates & ~higher_left & ~higher_right
+    to_delete |= slope_left & ( ( positions - peak_left ) % 2 == 0 )
+    to_delete |= slope_right & ( ( peak_right - positions ) % 2 == 0 )
+
+    deleted_neighbor = np.zeros(n, dtype=bool)
+    deleted_neighbor[1:]  |= to_delete[:-1]
+    deleted_neighbor[:-1] |= to_delete[1:]
+    to_delete |= higher_left & higher_right & ~deleted_neighbor
+
+    return to_delete
@@ -0,0 +1,29 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from ... DataOrganizer import DataPoints
+
+
+def _sample_indices(task) :
+    sampler, xs, ys = task
+    return sampler.sample_indices(DataPoints.create_from_xsys(xs, ys))
+
+
+def sample_indices_many(sampler, list_of_datapoints, workers=None, chunksize=8) :
+    """Returns 'sampler.sample_indices' of each 'DataPoints' object, in order of input.
+    Only x and y arrays are sent to worker processes, and positions are sent back.
+
+    Args :
+        sampler : sampler object with 'sample_indices' method. must be picklable if 'workers' != 1.
+        list_of_datapoints : list of 'DataPoints' objects.
+        workers : number of worker processes. (optional, if not set, number of CPUs.)
+                  if 1, runs sequentially in this process.
+        chunksize : number of series sent to a worker at once.
+    """
+
+    tasks = [ ( sampler, dps.xs, dps.ys ) for dps in list_of_datapoints ]
+
+    if workers == 1 or len(tasks) <= 1 :
+        return [ _sample_indices(task) for task in tasks ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor :
+        return list(executor.map(_sample_indices, tasks, chunksize=chunksize))
@@ -0,0 +1,203 @@
+import numpy as np
+
+
+def beyond_distance(distances, d) :
+    """Returns True where datapoints at x-'distances' are not neighbors within 'd'-distance.
+    This is the neighbor predicate of all local min/max samplers. ('x - v.x > d' of each datapoint)
+    """
+    return distances > d
+
+
+def window_bounds(xs, d, positions=None) :
+    """Returns [lo, hi) positions of datapoints within 'd'-distance of each datapoint.
+    'xs' must be sorted.
+
+    Bounds are searched with x -/+ d, which can differ from 'beyond_distance' of x-distances
+    in floating point. Distances are monotonic in position, so bounds are moved over runs of
+    the same x-value until both agree.
+
+    Args :
+        xs : sorted x-values.
+        d : distance.
+        positions : positions to evaluate. (optional, if not set, all positions.)
+    """
+
+    xs = np.asarray(xs)
+    centers = xs if positions is None else xs[np.asarray(positions)]
+
+    lo = np.searchsorted(xs, centers - d, side='left')
+    hi = np.searchsorted(xs, centers + d, side='right')
+
+    while True :
+        widen = lo > 0
+        widen[widen] = ~beyond_distance(centers[widen] - xs[lo[widen] - 1], d)
+        narrow = beyond_distance(centers - xs[lo], d)
+        if not ( widen.any() or narrow.any() ) :
+            break
+        lo[widen] = np.searchsorted(xs, xs[lo[widen] - 1], side='left')
+        lo[narrow] = np.searchsorted(xs, xs[lo[narrow]], side='right')
+
+    while True :
+        widen = hi < len(xs)
+        widen[widen] = ~beyond_distance(xs[hi[widen]] - centers[widen], d)
+        narrow = beyond_distance(xs[hi - 1] - centers, d)
+        if not ( widen.any() or narrow.any() ) :
+            break
+        hi[widen] = np.searchsorted(xs, xs[hi[widen]], side='right')
+        hi[narrow] = np.searchsorted(xs, xs[hi[narrow] - 1], side='left')
+
+    return lo, hi
+
+
+def _centered_window_min(values, k) :
+    """Returns min over [i-k, i+k] of each position with van Herk/Gil-Werman algorithm.
+    Each position costs 3 comparisons regardless of 'k'.
+    """
+
+    n = len(values)
+    w = 2*k + 1
+    nb = -(-(n + 2*k) // w)
+
+    padded = np.full(nb*w, np.inf)
+    padded[k:k+n] = values
+    blocks = padded.reshape(nb, w)
+
+    prefix = np.minimum.accumulate(blocks, axis=1).ravel()
+    suffix = np.minimum.accumulate(blocks[:,::-1], axis=1)[:,::-1].ravel()
+
+    return np.minimum(suffix[:n], prefix[w-1:w-1+n])
+
+
+def _range_min(values, lo, hi) :
+    """Returns min over [lo, hi) of each range with sparse table of power-of-two ranges.
+    Only levels up to the longest range are built.
+    """
+
+    lengths = hi - lo
+    levels = np.zeros(len(lengths), dtype=np.intp)
+    nonempty = lengths > 0
+    levels[nonempty] = np.floor(np.log2(lengths[nonempty])).astype(np.intp)
+
+    result = np.full(len(lo), np.inf)
+
+    table = values
+    for level in range(int(levels.max()) + 1 if len(levels) > 0 else 0) :
+        if level > 0 :
+            half = 1 << (level - 1)
+            table = np.minimum(table[:-half], table[half:])
+
+        at = np.flatnonzero(nonempty & ( levels == level ))
+        result[at] = np.minimum(table[lo[at]], table[hi[at] - (1 << level)])
+
+    return result
+
+
+def sliding_window_min(values, lo, hi) :
+    """Returns min of values[lo[i]:hi[i]] for each position i.
+    Fixed-width windows (clipped at both ends) use O(n) van Herk/Gil-Werman kernel,
+    and other windows use O(n log(max window size)) sparse table.
+
+    Args :
+        values : float values.
+        lo, hi : window bounds. (see 'window_bounds')
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0 :
+        return np.array([])
+
+    positions = np.arange(n)
+    k = int(( positions - lo ).max())
+    if np.array_equal(lo, np.maximum(positions - k, 0)) and np.array_equal(hi, np.minimum(positions + k + 1, n)) :
+        return _centered_window_min(values, k)
+
+    return _range_min(values, lo, hi)
+
+
+def local_extrema_mask(xs, ys, d, method) :
+    """Returns boolean mask of datapoints whose y-value is min ('method'='min') or max ('method'='max')
+    among datapoints within 'd'-distance. Tied datapoints are all selected.
+    """
+
+    ys = np.asarray(ys, dtype=np.float64)
+    if method == 'min' :
+        values = ys
+    elif method == 'max' :
+        values = -ys
+    else :
+        raise Exception("invalid value for 'method' : {}.".format(method))
+
+    lo, hi = window_bounds(np.asarray(xs), d)
+    return values == sliding_window_min(values, lo, hi)
+
+
+def previous_smaller(values) :
+    """Returns position of the nearest previous value strictly smaller than each value (-1 if none).
+    Searches a min tree of aligned power-of-two blocks, climbing to the nearest left block
+    holding a smaller value and descending into it. O(n log n) with O(n) memory.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+
+    tree = [values]
+    while len(tree[-1]) > 1 :
+        mins = tree[-1]
+        half = len(mins) // 2 * 2
+        tree.append(np.minimum(mins[0:half:2], mins[1:half:2]))
+
+    node  = np.full(n, -1)
+    level = np.full(n, -1)
+
+    # climb : check the block just left of the search bound on each level.
+    pending, bound, targets = np.arange(n), np.arange(n), values
+    for l, mins in enumerate(tree) :
+        hit = ( bound & 1 ).astype(bool)
+        hit[hit] = mins[bound[hit] - 1] < targets[hit]
+        node[pending[hit]] = bound[hit] - 1
+        level[pending[hit]] = l
+        keep = ~hit
+        pending, bound, targets = pending[keep], bound[keep] >> 1, targets[keep]
+
+    # descend : prefer the right child if it holds a smaller value.
+    # positions are ordered by found level, so positions on level l are a prefix.
+    order = np.argsort(-level, kind='stable')
+    node, targets = node[order], values[order]
+    counts = np.cumsum(np.bincount(len(tree) - 1 - level[order][level[order] >= 0], minlength=len(tree)))
+    for l in range(len(tree) - 1, 0, -1) :
+        at = slice(0, counts[len(tree) - 1 - l])
+        right = 2*node[at] + 1
+        node[at] = np.where(tree[l-1][right] < targets[at], right, right - 1)
+
+    previous = np.empty(n, dtype=np.intp)
+    previous[order] = node
+    return previous
+
+
+def swing_strengths(xs, ys, method) :
+    """Returns x-distance to the nearest datapoint with strictly smaller ('method'='min') or
+    larger ('method'='max') y-value of each datapoint (inf if none).
+    A datapoint is local min/max within 'd'-distance if and only if 'beyond_distance' of its strength is True.
+    Distances are computed in the dtype of 'xs', as 'window_bounds' does.
+    """
+
+    xs = np.asarray(xs)
+    ys = np.asarray(ys, dtype=np.float64)
+    if method == 'min' :
+        values = ys
+    elif method == 'max' :
+        values = -ys
+    else :
+        raise Exception("invalid value for 'method' : {}.".format(method))
+
+    n = len(values)
+    left  = previous_smaller(values)
+    right = n - 1 - previous_smaller(values[::-1])[::-1]
+
+    strengths = np.full(n, np.inf, dtype=xs.dtype if xs.dtype.kind == 'f' else np.float64)
+    has_left, has_right = left >= 0, right < n
+    strengths[has_left] = xs[has_left] - xs[left[has_left]]
+    strengths[has_right] = np.minimum(strengths[has_right], xs[right[has_right]] - xs[has_right])
+
+    return strengths
@@ -1,4 +1,4 @@
-from ... DataOrganizer import DataPoint, Chunk, Chunks
+from ... DataOrganizer import DataPoint, DataPoints, Chunk
 
 class TrendLineDetectorDataPoint(DataPoint) :
     
@@ -84,12 +84,50 @@ class TrendLineDetectorChunk(Chunk) :
             o.set_parent(obj)
         return obj
         
-class TrendLineDetectorChunks(Chunks) :
+class TrendLineDetectorChunks() :
+    """List of 'TrendLineDetectorChunk' objects.
+    Unlike 'Chunks', chunks are kept in a list (not CSR arrays), since chunks and datapoints are removed while fitting.
+    """
     
     def __init__(self,list_of_chunks,min_size=3) :
-        super().__init__(list_of_chunks)
+        self._data = list(list_of_chunks)
         self.MIN_SIZE = min_size
         
+    def __iter__(self) :
+        for c in self._data :
+            yield c
+            
+    def __repr__(self) :
+        s = '{}([{}])'.format(self.__class__.__name__, ','.join([ repr(c) for c in self ]))
+        return s
+    
+    def __str__(self) :
+        s = '{}(\n[{}])'.format(self.__class__.__name__, '\n,'.join([ str(c) for c in self ]))
+        return s
+            
+    def __len__(self) :
+        return len(self._data)
+    
+    def __getitem__(self,idx) :
+        if hasattr(idx,'__iter__') :
+            return self.__class__([ self._data[i] for i in idx ], min_size=self.MIN_SIZE)
+        elif isinstance(idx,slice) :
+            return self.__class__(self._data[idx], min_size=self.MIN_SIZE)
+        else :
+            return self._data[idx]
+        
+    def append(self,chunk) :
+        self._data.append(chunk)
+        
+    def to_datapoints(self) :
+        return DataPoints([ dp for c in self for dp in c ])
+    
+    def get_chunks_by_symbol(self,symbol) :
+        return self.__class__([ c for c in self if c.symbol == symbol ], min_size=self.MIN_SIZE)
+    
+    def copy(self) :
+        return self.__class__(list(self._data), min_size=self.MIN_SIZE)
+        
     @property
     def protected(self) :
         if len(self) <= self.MIN_SIZE :
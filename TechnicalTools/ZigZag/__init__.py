@@ -1 +1,3 @@
 from . zigzag_detector import ZigZagDetector
+from . threshold_zigzag_detector import ThresholdZigZagDetector
+from . live_zigzag import LiveZigZag
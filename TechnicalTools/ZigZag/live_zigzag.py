@@ -0,0 +1,234 @@
+import numpy as np
+from collections import deque
+from typing import Callable, Literal
+from .. DataOrganizer import DataPoint, DataPoints
+from .. DataOrganizer.utils.array_utils import readonly_view
+from . zigzag import ZigZag
+from . utils.threshold_utils import reversal_level
+
+
+class LiveZigZag() :
+    """Incremental form of 'ThresholdZigZagDetector' for live feeds.
+    Bars are pushed one by one, and the zigzag over all pushed bars is the same as
+    'ThresholdZigZagDetector.detect_from_candles' of them.
+
+    Confirmed pivots are kept in append-only buffers, so '.confirmed' is a view of them (no copy),
+    and the last pivot is tentative, i.e. moved while the leg is extended by new highs/lows.
+    Each push costs O(1) amortized, and fires 'callback' with events :
+      - ('confirmed', 'DataPoint') : a pivot is confirmed.
+      - ('moved', 'DataPoint') : the tentative pivot is created or moved.
+    """
+
+    INITIAL_BUFFER_SIZE = 1024
+
+    def __init__(self, threshold:float, method:Literal['percent','atr']='percent', atr_period:int=14,
+                 upper_symbol:str='H', lower_symbol:str='L', callback:Callable=None) :
+        """Init and set parameters.
+
+        Args :
+            threshold : ratio of move to reverse for 'percent' method (i.e. 0.05 for 5%),
+                        or multiple of ATR for 'atr' method.
+            method : 'percent' or 'atr'.
+            atr_period : number of bars averaged for ATR. (used only for 'atr' method)
+            upper_symbol : str to identify upper datapoints of zigzag.
+            lower_symbol : str to identify lower datapoints of zigzag.
+            callback : function(event:str, 'DataPoint') called on each event. (optional)
+        """
+
+        if method not in ('percent','atr') :
+            raise Exception("invalid value for 'method' : {}.".format(method))
+        if not threshold > 0 :
+            raise Exception("'threshold' must be positive : {}.".format(threshold))
+
+        self._threshold = threshold
+        self._method = method
+        self._atr_period = atr_period
+        self._upper_symbol = upper_symbol
+        self._lower_symbol = lower_symbol
+        self._callback = callback
+
+        size = self.INITIAL_BUFFER_SIZE
+        self._buffers = {
+            'x'      : np.empty(size, dtype=np.int64),
+            'y'      : np.empty(size),
+            'index'  : np.empty(size, dtype=np.int64),
+            'symbol' : np.empty(size, dtype=np.int32),
+        }
+        self._n_confirmed = 0
+
+        # pivots are (y, x, index). running high/low are tracked until the first reversal.
+        self._direction = 0
+        self._high = ( -np.inf, -1, None )
+        self._low  = ( np.inf, -1, None )
+        self._tentative = None
+        self._count = 0
+
+        # cumulative sums of true ranges of the last 'atr_period'+1 bars.
+        self._tr_sums = deque(maxlen=atr_period+1)
+        self._last_close = None
+
+
+    @property
+    def params(self) :
+        return {
+            'threshold' : self._threshold,
+            'method' : self._method,
+            'atr_period' : self._atr_period,
+            'upper_symbol' : self._upper_symbol,
+            'lower_symbol' : self._lower_symbol
+        }
+
+
+    def __len__(self) :
+        return self._n_confirmed + ( self._tentative is not None )
+
+
+    def _update_atr(self, high, low, close) :
+        """Returns ATR of the pushed bar. (same as 'calc_atr')"""
+
+        if close is None :
+            raise Exception("'close' is required for 'atr' method.")
+
+        true_range = high - low
+        if self._last_close is not None :
+            true_range = max(true_range, abs(high - self._last_close), abs(low - self._last_close))
+        self._last_close = close
+
+        total = true_range + ( self._tr_sums[-1] if self._tr_sums else 0.0 )
+        self._tr_sums.append(total)
+        if len(self._tr_sums) > self._atr_period :
+            return ( total - self._tr_sums[0] ) / self._atr_period
+        return total / len(self._tr_sums)
+
+
+    def _level(self, extreme, atr, upward) :
+        return reversal_level(extreme, self._threshold, self._method, atrs=atr, upward=upward)
+
+
+    def _datapoint(self, pivot, is_upper) :
+        y, x, index = pivot
+        return DataPoint(x, y, index=index, symbol=self._upper_symbol if is_upper else self._lower_symbol)
+
+
+    def _confirm(self, pivot, is_upper, events) :
+
+        i = self._n_confirmed
+        if i == len(self._buffers['x']) :
+            for name, buffer in self._buffers.items() :
+                new_buffer = np.empty(2*len(buffer), dtype=buffer.dtype)
+                new_buffer[:i] = buffer
+                self._buffers[name] = new_buffer
+
+        y, x, index = pivot
+        self._buffers['x'][i] = x
+        self._buffers['y'][i] = y
+        self._buffers['index'][i] = index
+        self._buffers['symbol'][i] = 0 if is_upper else 1
+        self._n_confirmed += 1
+
+        events.append(( 'confirmed', self._datapoint(pivot, is_upper) ))
+
+
+    def _move(self, pivot, events) :
+        self._tentative = pivot
+        events.append(( 'moved', self._datapoint(pivot, self._direction == 1) ))
+
+
+    def push(self, high:float, low:float, close:float=None, index:int=None) :
+        """Pushes a bar and returns events fired.
+
+        Args :
+            high : high value of the bar.
+            low : low value of the bar.
+            close : close value of the bar. (required for 'atr' method)
+            index : integer index of the bar. (optional, if not set, number of bars pushed before it.)
+
+        Returns : list of (event, 'DataPoint') tuples.
+        """
+
+        bar = self._count
+        index = bar if index is None else index
+        atr = self._update_atr(high, low, close) if self._method == 'atr' else None
+        self._count += 1
+
+        events = []
+        if self._direction == 0 :
+            if high > self._high[0] :
+                self._high = ( high, bar, index )
+            if low < self._low[0] :
+                self._low = ( low, bar, index )
+
+            ( high_y, high_x, _ ), ( low_y, low_x, _ ) = self._high, self._low
+            if high_x > low_x and high_y >= self._level(low_y, atr, True) :
+                self._confirm(self._low, False, events)
+                self._direction = 1
+                self._move(self._high, events)
+            elif low_x > high_x and low_y <= self._level(high_y, atr, False) :
+                self._confirm(self._high, True, events)
+                self._direction = -1
+                self._move(self._low, events)
+
+        elif self._direction == 1 :
+            if high > self._tentative[0] :
+                self._move(( high, bar, index ), events)
+            elif low <= self._level(self._tentative[0], atr, False) :
+                self._confirm(self._tentative, True, events)
+                self._direction = -1
+                self._move(( low, bar, index ), events)
+
+        else :
+            if low < self._tentative[0] :
+                self._move(( low, bar, index ), events)
+            elif high >= self._level(self._tentative[0], atr, True) :
+                self._confirm(self._tentative, False, events)
+                self._direction = 1
+                self._move(( high, bar, index ), events)
+
+        if self._callback is not None :
+            for event, dp in events :
+                self._callback(event, dp)
+
+        return events
+
+
+    @property
+    def tentative(self) :
+        """tentative last pivot. (None until the first reversal)"""
+        if self._tentative is not None :
+            return self._datapoint(self._tentative, self._direction == 1)
+
+
+    def _create_zigzag(self, columns) :
+        datapoints = DataPoints._create_from_columns(columns, (self._upper_symbol, self._lower_symbol))
+        return ZigZag.create_from_datapoints(datapoints, self._upper_symbol, self._lower_symbol)
+
+
+    @property
+    def confirmed(self) :
+        """'ZigZag' objects of confirmed pivots, sharing the append-only buffers (no copy)."""
+        n = self._n_confirmed
+        return self._create_zigzag({ name : readonly_view(buffer[:n]) for name, buffer in self._buffers.items() })
+
+
+    def to_zigzag(self) :
+        """Returns 'ZigZag' objects of confirmed pivots and the tentative pivot."""
+
+        n = self._n_confirmed
+        columns = { name : buffer[:n].copy() for name, buffer in self._buffers.items() }
+        if self._tentative is not None :
+            y, x, index = self._tentative
+            tail = { 'x' : x, 'y' : y, 'index' : index, 'symbol' : 0 if self._direction == 1 else 1 }
+            columns = { name : np.append(column, np.array([tail[name]], dtype=column.dtype))
+                        for name, column in columns.items() }
+
+        return self._create_zigzag(columns)
+
+
+    @property
+    def upper_points(self) :
+        return self.to_zigzag().upper_points
+
+
+    @property
+    def lower_points(self) :
+        return self.to_zigzag().lower_points
@@ -0,0 +1,221 @@
+import numpy as np
+from typing import Literal
+from .. DataOrganizer import Candles, DataPoints
+from . zigzag import ZigZag
+from . utils.threshold_utils import calc_atr, reversal_terms, reversal_level
+
+
+class ThresholdZigZagDetector() :
+    """Detects zigzag directly from high/low columns of 'Candles',
+    reversing after a move of 'threshold' ratio ('percent') or 'threshold' times ATR ('atr').
+
+    Bars are walked once with the following rules :
+      - until the first reversal, running high/low are tracked, and a pivot is confirmed when
+        the later extreme moved from the earlier one by the threshold.
+      - in an up leg, a bar with a higher high extends the tentative upper pivot.
+        otherwise, if its low reaches the reversal level from the tentative high, the upper pivot
+        is confirmed and the bar's low becomes the tentative lower pivot. (down legs are symmetric)
+      - the tentative pivot at the end of data is included in the zigzag.
+    The first reversal is searched over windows of doubling size with numpy, and the rest of bars are
+    walked in a single Python loop over blocks converted to lists, so the cost is O(n) in total
+    and does not depend on the number of legs.
+    """
+
+
+    def __init__(self, threshold:float, method:Literal['percent','atr']='percent', atr_period:int=14,
+                 upper_symbol:str='H', lower_symbol:str='L') :
+        """Init detector and set parameters.
+
+        Args :
+            threshold : ratio of move to reverse for 'percent' method (i.e. 0.05 for 5%),
+                        or multiple of ATR for 'atr' method.
+            method : 'percent' or 'atr'.
+            atr_period : number of bars averaged for ATR. (used only for 'atr' method)
+            upper_symbol : str to identify upper datapoints of zigzag.
+            lower_symbol : str to identify lower datapoints of zigzag.
+        """
+
+        if method not in ('percent','atr') :
+            raise Exception("invalid value for 'method' : {}.".format(method))
+        if not threshold > 0 :
+            raise Exception("'threshold' must be positive : {}.".format(threshold))
+
+        self._threshold = threshold
+        self._method = method
+        self._atr_period = atr_period
+        self._upper_symbol = upper_symbol
+        self._lower_symbol = lower_symbol
+
+        self._block_size = 65536
+
+
+    @property
+    def params(self) :
+        return {
+            'threshold' : self._threshold,
+            'method' : self._method,
+            'atr_period' : self._atr_period,
+            'upper_symbol' : self._upper_symbol,
+            'lower_symbol' : self._lower_symbol
+        }
+
+
+    def _level(self, extremes, atrs, upward) :
+        return reversal_level(extremes, self._threshold, self._method, atrs=atrs, upward=upward)
+
+
+    @staticmethod
+    def _running_extremes(values, start, initial, initial_pos, accumulate, extends) :
+        """Returns running extremes before each bar, mask of extending bars and positions of running extremes."""
+
+        previous = accumulate(np.concatenate(([initial], values)))[:-1]
+        extended = extends(values, previous)
+        positions = np.maximum.accumulate(np.where(extended, np.arange(start, start + len(values)), initial_pos))
+        return previous, extended, positions
+
+
+    def _search_start(self, highs, lows, atrs) :
+        """Searches the first reversal.
+
+        Returns : (bar of reversal, position of confirmed pivot, 1 for up leg or -1 for down leg, tentative extreme, its position)
+                  or None if no reversal.
+        """
+
+        n = len(highs)
+        high, high_pos, low, low_pos = -np.inf, -1, np.inf, -1
+        start, width = 0, 64
+        while start < n :
+            end = min(n, start + width)
+            hs, ls = highs[start:end], lows[start:end]
+
+            high_prev, high_ext, high_poss = self._running_extremes(hs, start, high, high_pos, np.maximum.accumulate, np.greater)
+            low_prev, low_ext, low_poss = self._running_extremes(ls, start, low, low_pos, np.minimum.accumulate, np.less)
+            high_cur = np.where(high_ext, hs, high_prev)
+            low_cur = np.where(low_ext, ls, low_prev)
+
+            atr = None if atrs is None else atrs[start:end]
+            up = ( high_poss > low_poss ) & ( high_cur >= self._level(low_cur, atr, True) )
+            down = ( low_poss > high_poss ) & ( low_cur <= self._level(high_cur, atr, False) )
+
+            hits = np.flatnonzero(up | down)
+            if len(hits) > 0 :
+                r = hits[0]
+                if up[r] :
+                    return start + r, low_poss[r], 1, high_cur[r], high_poss[r]
+                return start + r, high_poss[r], -1, low_cur[r], low_poss[r]
+
+            high, high_pos, low, low_pos = high_cur[-1], high_poss[-1], low_cur[-1], low_poss[-1]
+            start, width = end, width*2
+
+        return None
+
+
+    def _walk_legs(self, highs, lows, terms, start, extreme, extreme_pos, direction) :
+        """Walks bars from 'start' after the first reversal, in a single Python loop.
+        Bars are converted to lists by blocks, so each bar costs a few float comparisons,
+        and a reversal costs only an append, however short the legs are.
+
+        Args :
+            terms : (factor, offsets) of reversal levels of up legs and down legs. (offsets are None for 'percent' method)
+            extreme, extreme_pos : tentative pivot of the leg at 'start', and its position.
+            direction : 1 for up leg, -1 for down leg.
+
+        Returns : positions of confirmed pivots and the tentative pivot at the end of data.
+        """
+
+        ( down_factor, down_offsets ), ( up_factor, up_offsets ) = terms
+        extreme, extreme_pos, up = float(extreme), int(extreme_pos), direction == 1
+        positions = []
+        append = positions.append
+
+        n = len(highs)
+        for block_start in range(start, n, self._block_size) :
+            block_stop = min(n, block_start + self._block_size)
+            bars = range(block_start, block_stop)
+            hs, ls = highs[block_start:block_stop].tolist(), lows[block_start:block_stop].tolist()
+            if down_offsets is None :
+                down_os = up_os = [0.0]*len(bars)
+            else :
+                down_os, up_os = down_offsets[block_start:block_stop].tolist(), up_offsets[block_start:block_stop].tolist()
+
+            for bar, high, low, down_offset, up_offset in zip(bars, hs, ls, down_os, up_os) :
+                if up :
+                    if high > extreme :
+                        extreme, extreme_pos = high, bar
+                    elif low <= extreme*down_factor + down_offset :
+                        append(extreme_pos)
+                        up, extreme, extreme_pos = False, low, bar
+                else :
+                    if low < extreme :
+                        extreme, extreme_pos = low, bar
+                    elif high >= extreme*up_factor + up_offset :
+                        append(extreme_pos)
+                        up, extreme, extreme_pos = True, high, bar
+
+        append(extreme_pos)
+        return positions
+
+
+    def detect_indices(self, highs, lows, closes=None) :
+        """Returns bar positions of zigzag pivots, and mask of upper pivots.
+        The last pivot is tentative.
+
+        Args :
+            highs : high values of bars.
+            lows : low values of bars.
+            closes : close values of bars. (required for 'atr' method)
+        """
+
+        highs = np.asarray(highs, dtype=np.float64)
+        lows  = np.asarray(lows, dtype=np.float64)
+
+        atrs = None
+        if self._method == 'atr' :
+            if closes is None :
+                raise Exception("'closes' are required for 'atr' method.")
+            atrs = calc_atr(highs, lows, closes, self._atr_period)
+
+        found = self._search_start(highs, lows, atrs)
+        if found is None :
+            return np.array([], dtype=np.int64), np.array([], dtype=bool)
+
+        bar, pivot_pos, direction, extreme, extreme_pos = found
+
+        terms = []
+        for upward in (False, True) :
+            factor, offsets = reversal_terms(self._threshold, self._method, atrs=atrs, upward=upward)
+            terms.append(( factor, None if atrs is None else offsets ))
+
+        positions = [pivot_pos] + self._walk_legs(highs, lows, terms, bar + 1, extreme, extreme_pos, direction)
+
+        # pivots alternate, and the first pivot is upper if the first leg is a down leg.
+        is_uppers = np.arange(len(positions)) % 2 == ( 0 if direction == -1 else 1 )
+
+        return np.array(positions, dtype=np.int64), is_uppers
+
+
+    def detect_from_candles(self, candles:Candles) :
+        """Detects zigzag from candles.
+        x-values of zigzag are positions of bars, and y-values are highs of upper pivots and lows of lower pivots.
+
+        Args :
+            candles : 'Candles' objects.
+
+        Returns : 'ZigZag' objects.
+        """
+
+        if not isinstance(candles,Candles) :
+            raise Exception("variable 'candles' is not 'Candles' object but {}".format(candles) )
+
+        highs, lows = candles.highs, candles.lows
+        positions, is_uppers = self.detect_indices(highs, lows, candles.closes if self._method == 'atr' else None)
+
+        columns = {
+            'x'      : positions,
+            'y'      : np.where(is_uppers, highs[positions], lows[positions]),
+            'index'  : candles.indices[positions],
+            'symbol' : np.where(is_uppers, 0, 1).astype(np.int32),
+        }
+        datapoints = DataPoints._create_from_columns(columns, (self._upper_symbol, self._lower_symbol))
+
+        return ZigZag.create_from_datapoints(datapoints, self._upper_symbol, self._lower_symbol)
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def calc_atr(highs, lows, closes, period=14) :
+    """Returns average true range, simple moving average of true ranges over 'period' bars.
+    True range of the first bar is high - low, and the first 'period'-1 bars are averaged over available bars.
+    """
+
+    highs  = np.asarray(highs, dtype=np.float64)
+    lows   = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+
+    true_ranges = highs - lows
+    if len(closes) > 1 :
+        previous = closes[:-1]
+        true_ranges[1:] = np.maximum(true_ranges[1:], np.maximum(np.abs(highs[1:] - previous), np.abs(lows[1:] - previous)))
+
+    sums = np.cumsum(true_ranges)
+    sums[period:] = sums[period:] - sums[:-period]
+    return sums / np.minimum(np.arange(1, len(sums)+1), period)
+
+
+def reversal_terms(threshold, method, atrs=None, upward=True) :
+    """Returns (factor, offsets) of reversal levels, i.e. level = extreme*factor + offsets.
+    Upward reversal from a low needs high >= level, and downward reversal from a high needs low <= level.
+
+    Args :
+        threshold : ratio of move for 'percent' method, or multiple of ATR for 'atr' method.
+        method : 'percent' or 'atr'.
+        atrs : ATR values of the bars evaluated. (required for 'atr' method)
+        upward : True for upward reversal from a low.
+    """
+
+    sign = 1 if upward else -1
+    if method == 'percent' :
+        return 1 + sign*threshold, 0.0
+    return 1.0, sign*threshold*atrs
+
+
+def reversal_level(extremes, threshold, method, atrs=None, upward=True) :
+    """Returns price levels to reverse from 'extremes'. see 'reversal_terms' for args.
+    Scalars and arrays are both accepted.
+    """
+
+    factor, offsets = reversal_terms(threshold, method, atrs=atrs, upward=upward)
+    return extremes*factor + offsets
@@ -12,6 +12,15 @@ class ZigZag(DataPoints) :
         self._lower_symbol = lower_symbol
 
 
+    @classmethod
+    def create_from_datapoints(cls, datapoints:DataPoints, upper_symbol:str, lower_symbol:str) :
+        """Returns new 'ZigZag' objects sharing column arrays of 'datapoints'. (no copy)"""
+        obj = datapoints._take(slice(None), cls=cls)
+        obj._upper_symbol = upper_symbol
+        obj._lower_symbol = lower_symbol
+        return obj
+
+
     @property
     def params(self) :
         return {
@@ -20,11 +29,19 @@ class ZigZag(DataPoints) :
         }
 
 
+    def _points_by_symbol(self, symbol) :
+        if symbol in self._symbol_table :
+            mask = self._columns['symbol'] == self._symbol_table.index(symbol)
+        else :
+            mask = slice(0,0)
+        return self._take(mask, cls=DataPoints)
+
+
     @property
     def upper_points(self) :
-        return DataPoints([ dp for dp in self if dp.symbol == self._upper_symbol])
+        return self._points_by_symbol(self._upper_symbol)
 
 
     @property
     def lower_points(self) :
-        return DataPoints([ dp for dp in self if dp.symbol == self._lower_symbol])
+        return self._points_by_symbol(self._lower_symbol)
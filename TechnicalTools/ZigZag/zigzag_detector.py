@@ -1,4 +1,6 @@
+import numpy as np
 from typing import Callable
+from .. DataOrganizer import Chunks
 from . zigzag import ZigZag
 
 
@@ -52,13 +54,68 @@ class ZigZagDetector() :
         return min(chunk,key=lambda c:c.y)
             
         
+    def _select_by_chunk(self, chunks, symbol, ufunc) :
+        """Returns positions in 'chunks.to_datapoints()' of the first max/min datapoint
+        of each chunk with 'symbol', and mask of those chunks."""
+
+        selected = chunks.symbols == symbol
+        starts = chunks.offsets[:-1][selected]
+        lengths = chunks.lengths[selected]
+        if len(starts) == 0 :
+            return np.array([], dtype=np.intp), selected
+        if np.any(lengths == 0) :
+            raise Exception("chunk with symbol '{}' is empty.".format(symbol))
+
+        # gather datapoints of selected chunks, and take the first position of reduced value.
+        local_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        positions = np.repeat(starts - local_starts, lengths) + np.arange(lengths.sum())
+        ys = chunks.to_datapoints().ys[positions]
+
+        extremes = ufunc.reduceat(ys, local_starts)
+        hits = np.where(ys == np.repeat(extremes, lengths), np.arange(len(ys)), len(ys))
+
+        return positions[np.minimum.reduceat(hits, local_starts)], selected
+
+
+    def detect_indices_from_chunks(self,chunks) :
+        """Returns positions of zigzag datapoints in 'chunks.to_datapoints()', in order of chunks.
+        Only default selecting functions are supported. highest (lowest) datapoint is selected
+        from each upper (lower) chunk, with segment reductions over the flat chunk arrays.
+
+        Args :
+            chunks : 'Chunks' object.
+        """
+
+        if self._upper_select_func is not self._default_upper_select_func \
+            or self._lower_select_func is not self._default_lower_select_func :
+            raise Exception("'detect_indices_from_chunks' is not supported with user defined select functions.")
+
+        upper_positions, is_upper = self._select_by_chunk(chunks, self._upper_symbol, np.maximum)
+        lower_positions, is_lower = self._select_by_chunk(chunks, self._lower_symbol, np.minimum)
+
+        # merge in order of chunks.
+        positions = np.empty(np.count_nonzero(is_upper | is_lower), dtype=np.intp)
+        is_upper_selected = is_upper[is_upper | is_lower]
+        positions[is_upper_selected]  = upper_positions
+        positions[~is_upper_selected] = lower_positions
+
+        return positions
+
+
     def detect_from_chunks(self,chunks) :
         """Create 'ZigZag' object from 'Chunks' object, selecting one datapoint from each chunks.
         Default selecting functions are which returns max or min data point from a chunk.
+        With default selecting functions, datapoints are gathered by 'detect_indices_from_chunks'.
         
         Args :
             chunks : 'Chunks' object.
         """
+
+        if self._upper_select_func is self._default_upper_select_func \
+            and self._lower_select_func is self._default_lower_select_func \
+            and isinstance(chunks,Chunks) :
+            return ZigZag.create_from_datapoints(chunks.to_datapoints()[self.detect_indices_from_chunks(chunks)],
+                                                 upper_symbol=self._upper_symbol, lower_symbol=self._lower_symbol)
             
         dps = []
         for c in chunks :
@@ -68,5 +125,3 @@ class ZigZagDetector() :
                 dps.append(self._lower_select_func(c))
                 
         return ZigZag(dps, upper_symbol=self._upper_symbol, lower_symbol=self._lower_symbol)
-    
-    
@@ -0,0 +1,49 @@
+"""Benchmark of 'Candles.create_from_pandas' and 'Candles.to_pandas'.
+
+Usage (from the repository root) : PYTHONPATH=. python benchmarks/bench_candles_pandas.py [max_exponent]
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from TechnicalTools.DataOrganizer import Candles
+
+
+def make_dataframe(n, seed=0) :
+    rng = np.random.default_rng(seed)
+    closes = 100 + np.cumsum(rng.normal(0, 1, n))
+    opens  = np.r_[closes[0], closes[:-1]]
+    highs  = np.maximum(opens, closes) + rng.random(n)
+    lows   = np.minimum(opens, closes) - rng.random(n)
+    return pd.DataFrame({ 'Open' : opens, 'High' : highs, 'Low' : lows, 'Close' : closes,
+                          'Volume' : rng.integers(100, 10000, n).astype(float) },
+                        index=pd.date_range('2000-01-01', periods=n, freq='min', name='Date'))
+
+
+def timeit(func, repeat=3) :
+    best = float('inf')
+    for _ in range(repeat) :
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(max_exponent=7) :
+
+    print('{:>10} {:>14} {:>14} {:>14}'.format('rows', 'column copy', 'from pandas', 'to pandas'))
+    for e in range(3, max_exponent+1) :
+        pdf = make_dataframe(10**e)
+        candles = Candles.create_from_pandas(pdf)
+
+        t_copy = timeit(lambda : [ pdf[c].to_numpy(copy=True) for c in ('Open', 'High', 'Low', 'Close', 'Volume') ])
+        t_from = timeit(lambda : Candles.create_from_pandas(pdf))
+        t_to   = timeit(lambda : candles.to_pandas())
+
+        print('{:>10} {:>12.2f}ms {:>12.2f}ms {:>12.2f}ms'.format(10**e, t_copy*1e3, t_from*1e3, t_to*1e3))
+
+
+if __name__ == '__main__' :
+    main(*[ int(a) for a in sys.argv[1:] ])
@@ -0,0 +1,73 @@
+"""Benchmark of 'UpperLowerChunker.chunk_down'.
+'per point' is the previous implementation (Python sort with key function, and a chunk
+appended point by point), measured only up to 10^5 datapoints.
+
+Usage (from the repository root) : PYTHONPATH=. python benchmarks/bench_chunker.py [max_exponent]
+"""
+import sys
+import time
+
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoint, DataPoints
+from TechnicalTools.Chunker import UpperLowerChunker
+
+
+def make_inputs(n, seed=0) :
+    rng = np.random.default_rng(seed)
+    upper_xs = np.sort(rng.choice(4*n, n, replace=False))
+    lower_xs = np.sort(rng.choice(4*n, n, replace=False))
+    upper = DataPoints.create_from_xsys(upper_xs, rng.random(n) + 1, indices=upper_xs, symbols=['H']*n)
+    lower = DataPoints.create_from_xsys(lower_xs, rng.random(n), indices=lower_xs, symbols=['L']*n)
+    return upper, lower, rng.choice(['black','white'], n).tolist(), rng.choice(['black','white'], n).tolist()
+
+
+def per_point_chunk_down(upper, lower, upper_bws, lower_bws, upper_symbol='H', lower_symbol='L') :
+
+    def sortkey(dp, bw) :
+        first = ( dp.symbol == upper_symbol and bw == 'white' ) or ( dp.symbol == lower_symbol and bw == 'black' )
+        return ( dp.x, 1 if first else 2 )
+
+    tmp = list(zip(upper, upper_bws)) + list(zip(lower, lower_bws))
+    tmp.sort(key=lambda item : sortkey(*item))
+
+    chunks = []
+    for dp, _ in tmp :
+        if not isinstance(dp, DataPoint) :
+            raise Exception()
+        if chunks and chunks[-1][0].symbol == dp.symbol :
+            chunks[-1].append(dp)
+        else :
+            chunks.append([dp])
+    return chunks
+
+
+def timeit(func, repeat=3) :
+    best = float('inf')
+    for _ in range(repeat) :
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(max_exponent=7) :
+
+    chunker = UpperLowerChunker('H', 'L')
+
+    print('{:>10} {:>14} {:>14}'.format('points', 'chunk_down', 'per point'))
+    for e in range(3, max_exponent+1) :
+        upper, lower, upper_bws, lower_bws = make_inputs(10**e // 2)
+
+        t_chunk = timeit(lambda : chunker.chunk_down(upper, lower, upper_bws, lower_bws))
+
+        t_loop = float('nan')
+        if e <= 5 :
+            upper_list, lower_list = list(upper), list(lower)
+            t_loop = timeit(lambda : per_point_chunk_down(upper_list, lower_list, upper_bws, lower_bws), repeat=1)
+
+        print('{:>10} {:>12.2f}ms {:>12.2f}ms'.format(10**e, t_chunk*1e3, t_loop*1e3))
+
+
+if __name__ == '__main__' :
+    main(*[ int(a) for a in sys.argv[1:] ])
@@ -0,0 +1,94 @@
+"""Benchmark of 'ConvexSampler.sample' in 'round' and 'greedy' modes.
+'per point' is the previous implementation (convexity of each linked datapoint computed
+with Python attribute math on every round), measured only up to 10^4 datapoints.
+
+Usage (from the repository root) : PYTHONPATH=. python benchmarks/bench_convex_sampler.py [max_exponent] [w]
+"""
+import sys
+import time
+
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoints
+from TechnicalTools.DataSampler import ConvexSampler
+
+
+def make_datapoints(n, seed=0) :
+    rng = np.random.default_rng(seed)
+    return DataPoints.create_from_xsys(np.arange(n), 100 + np.cumsum(rng.normal(0, 1, n)))
+
+
+def per_point_sample(xs, ys, w, maxiter) :
+
+    n = len(xs)
+    left  = list(range(-1, n-1))
+    right = list(range(1, n+1))
+    deleted = [False]*n
+    xmin, xmax = xs[0], xs[-1]
+
+    def convexity(i) :
+        l, r = left[i], right[i]
+        dyl, dxl = ( ys[i] - ys[l], xs[i] - xs[l] ) if l >= 0 else ( 0, 2*( xs[i] - xmin ) + 1 )
+        dyr, dxr = ( ys[r] - ys[i], xs[r] - xs[i] ) if r < n else ( 0, 2*( xmax - xs[i] ) + 1 )
+        if dxl + dxr <= w :
+            return ( dyr/dxr - dyl/dxl ) / ( dxl + dxr )
+
+    for _ in range(maxiter) :
+        live = [ i for i in range(n) if not deleted[i] ]
+        candidates = []
+        for i in live :
+            c = convexity(i)
+            if c and c > 0 :
+                candidates.append((c, i))
+        candidates.sort(key=lambda ci : abs(ci[0]), reverse=True)
+
+        cnt = 0
+        for _, i in candidates :
+            if ( left[i] >= 0 and deleted[left[i]] ) or ( right[i] < n and deleted[right[i]] ) :
+                continue
+            deleted[i] = True
+            cnt += 1
+
+        live = [ i for i in live if not deleted[i] ]
+        for l, i, r in zip([-1] + live[:-1], live, live[1:] + [n]) :
+            left[i], right[i] = l, r
+        if cnt == 0 :
+            break
+
+    return [ i for i in range(n) if not deleted[i] ]
+
+
+def timeit(func, repeat=3) :
+    best = float('inf')
+    for _ in range(repeat) :
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(max_exponent=6, w=10) :
+
+    round_sampler  = ConvexSampler('upward', w=w, mode='round')
+    greedy_sampler = ConvexSampler('upward', w=w, mode='greedy')
+
+    print('{:>10} {:>14} {:>14} {:>14} {:>10} {:>10}'.format(
+        'points', 'round', 'greedy', 'per point', 'kept(r)', 'kept(g)'))
+    for e in range(3, max_exponent+1) :
+        data = make_datapoints(10**e)
+
+        t_round  = timeit(lambda : round_sampler.sample(data))
+        t_greedy = timeit(lambda : greedy_sampler.sample(data))
+
+        t_loop = float('nan')
+        if e <= 4 :
+            xs, ys = data.xs.tolist(), data.ys.tolist()
+            t_loop = timeit(lambda : per_point_sample(xs, ys, w, max(1,int(w))), repeat=1)
+
+        print('{:>10} {:>12.2f}ms {:>12.2f}ms {:>12.2f}ms {:>10} {:>10}'.format(
+            10**e, t_round*1e3, t_greedy*1e3, t_loop*1e3,
+            len(round_sampler.sample(data)), len(greedy_sampler.sample(data))))
+
+
+if __name__ == '__main__' :
+    main(*[ int(a) for a in sys.argv[1:] ])
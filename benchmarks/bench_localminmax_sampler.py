@@ -0,0 +1,71 @@
+"""Benchmark of 'LocalMinMaxSampler.sample'.
+Regularly spaced x-values use van Herk/Gil-Werman kernel and irregular x-values use sparse table.
+'per point' loop is the previous implementation (neighbor walk and sort for each datapoint),
+measured only up to 10^5 datapoints.
+
+Usage (from the repository root) : PYTHONPATH=. python benchmarks/bench_localminmax_sampler.py [max_exponent] [d]
+"""
+import sys
+import time
+
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoints
+from TechnicalTools.DataSampler import LocalMinMaxSampler
+
+
+def make_datapoints(n, regular=True, seed=0) :
+    rng = np.random.default_rng(seed)
+    xs = np.arange(n) if regular else np.cumsum(rng.integers(1, 4, n))
+    ys = 100 + np.cumsum(rng.normal(0, 1, n))
+    return DataPoints.create_from_xsys(xs, ys, indices=np.arange(n))
+
+
+def per_point_sample(xs, ys, d) :
+    sampled = []
+    for i in range(len(xs)) :
+        neighbors = [i]
+        j = i - 1
+        while j >= 0 and xs[i] - xs[j] <= d :
+            neighbors.append(j)
+            j -= 1
+        j = i + 1
+        while j < len(xs) and xs[j] - xs[i] <= d :
+            neighbors.append(j)
+            j += 1
+        if sorted(neighbors, key=lambda k : ys[k])[0] == i :
+            sampled.append(i)
+    return sampled
+
+
+def timeit(func, repeat=3) :
+    best = float('inf')
+    for _ in range(repeat) :
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(max_exponent=7, d=6) :
+
+    sampler = LocalMinMaxSampler('min', d=d)
+
+    print('{:>10} {:>14} {:>14} {:>14}'.format('points', 'regular x', 'irregular x', 'per point'))
+    for e in range(3, max_exponent+1) :
+        regular   = make_datapoints(10**e, regular=True)
+        irregular = make_datapoints(10**e, regular=False)
+
+        t_regular   = timeit(lambda : sampler.sample(regular))
+        t_irregular = timeit(lambda : sampler.sample(irregular))
+
+        t_loop = float('nan')
+        if e <= 5 :
+            xs, ys = regular.xs.tolist(), regular.ys.tolist()
+            t_loop = timeit(lambda : per_point_sample(xs, ys, d), repeat=1)
+
+        print('{:>10} {:>12.2f}ms {:>12.2f}ms {:>12.2f}ms'.format(10**e, t_regular*1e3, t_irregular*1e3, t_loop*1e3))
+
+
+if __name__ == '__main__' :
+    main(*[ int(a) for a in sys.argv[1:] ])
@@ -0,0 +1,42 @@
+"""Benchmark of 'sample_many' of samplers with different number of worker processes.
+
+Usage (from the repository root) : PYTHONPATH=. python benchmarks/bench_sample_many.py [n_series] [length]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoints
+from TechnicalTools.DataSampler import LocalMinMaxSampler, ConvexSampler
+
+
+def make_series(n_series, length, seed=0) :
+    rng = np.random.default_rng(seed)
+    return [ DataPoints.create_from_xsys(np.arange(length), 100 + np.cumsum(rng.normal(0, 1, length)))
+             for _ in range(n_series) ]
+
+
+def main(n_series=256, length=100000) :
+
+    series = make_series(n_series, length)
+    samplers = { 'local_min' : LocalMinMaxSampler('min', d=6), 'convex' : ConvexSampler('upward', w=10) }
+
+    workers = [ 1 ]
+    while workers[-1]*2 <= ( os.cpu_count() or 1 ) :
+        workers.append(workers[-1]*2)
+
+    print('{:>10} {:>8} {:>12} {:>10}'.format('sampler', 'workers', 'time', 'speedup'))
+    for name, sampler in samplers.items() :
+        base = None
+        for w in workers :
+            t0 = time.perf_counter()
+            sampler.sample_many(series, workers=w)
+            t = time.perf_counter() - t0
+            base = t if base is None else base
+            print('{:>10} {:>8} {:>10.2f}s {:>9.2f}x'.format(name, w, t, base/t))
+
+
+if __name__ == '__main__' :
+    main(*[ int(a) for a in sys.argv[1:] ])
@@ -0,0 +1,62 @@
+"""Benchmark of 'ThresholdZigZagDetector.detect_from_candles' with 'percent' and 'atr' methods.
+'pipeline' is the zigzag through sampler, chunker and 'ZigZagDetector'
+('LocalMinMaxSampler' with d=6, 'UpperLowerChunker.chunk_from_candles').
+
+Usage (from the repository root) : PYTHONPATH=. python benchmarks/bench_threshold_zigzag.py [max_exponent]
+"""
+import sys
+import time
+
+import numpy as np
+
+from TechnicalTools.DataOrganizer import Candles
+from TechnicalTools.DataSampler import LocalMinMaxSampler
+from TechnicalTools.Chunker import UpperLowerChunker
+from TechnicalTools.ZigZag import ZigZagDetector, ThresholdZigZagDetector
+
+
+def make_candles(n, seed=0) :
+    rng = np.random.default_rng(seed)
+    closes = 100*np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    opens  = np.concatenate(([100.], closes[:-1]))
+    highs  = np.maximum(opens, closes)*( 1 + np.abs(rng.normal(0, 0.001, n)) )
+    lows   = np.minimum(opens, closes)*( 1 - np.abs(rng.normal(0, 0.001, n)) )
+    return Candles.create_from_arrays(opens, highs, lows, closes)
+
+
+def pipeline_zigzag(candles) :
+    chunker = UpperLowerChunker('H', 'L')
+    chunks = chunker.chunk_from_candles(candles, LocalMinMaxSampler('max', d=6), LocalMinMaxSampler('min', d=6))
+    return ZigZagDetector('H', 'L').detect_from_chunks(chunks)
+
+
+def timeit(func, repeat=3) :
+    best = float('inf')
+    for _ in range(repeat) :
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(max_exponent=6) :
+
+    percent = ThresholdZigZagDetector(0.01, method='percent')
+    atr     = ThresholdZigZagDetector(3, method='atr')
+
+    print('{:>10} {:>14} {:>14} {:>14} {:>10} {:>10}'.format(
+        'bars', 'percent', 'atr', 'pipeline', 'pivots(p)', 'pivots(a)'))
+    for e in range(3, max_exponent+1) :
+        candles = make_candles(10**e)
+
+        t_percent  = timeit(lambda : percent.detect_from_candles(candles))
+        t_atr      = timeit(lambda : atr.detect_from_candles(candles))
+        t_pipeline = timeit(lambda : pipeline_zigzag(candles), repeat=1)
+
+        print('{:>10} {:>12.2f}ms {:>12.2f}ms {:>12.2f}ms {:>10} {:>10}'.format(
+            10**e, t_percent*1e3, t_atr*1e3, t_pipeline*1e3,
+            len(percent.detect_from_candles(candles)), len(atr.detect_from_candles(candles))))
+
+
+if __name__ == '__main__' :
+    main(*[ int(a) for a in sys.argv[1:] ])
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from TechnicalTools.DataOrganizer import Candles
+
+
+def random_candles(n=3000, seed=0, dated=True) :
+    """Candles with irregular gaps of minutes to days between dates."""
+
+    rng = np.random.default_rng(seed)
+    closes = 100 + np.round(np.cumsum(rng.normal(0, 1, n)), 2)
+    opens  = np.concatenate(([100.], closes[:-1]))
+    highs  = np.maximum(opens, closes) + np.round(rng.random(n), 2)
+    lows   = np.minimum(opens, closes) - np.round(rng.random(n), 2)
+    volumes = rng.integers(1, 100, n).astype(np.float64)
+    dates = None
+    if dated :
+        steps = rng.choice([1, 1, 5, 17, 60, 600, 3000], n).astype('timedelta64[m]')
+        dates = np.datetime64('2023-12-29T22:00', 'ns') + np.cumsum(steps)
+    return Candles.create_from_arrays(opens, highs, lows, closes, volumes=volumes, dates=dates)
+
+
+def assert_same_bars(candles, bars) :
+    assert np.array_equal(candles.dates, bars.index.to_numpy().astype(candles.dates.dtype))
+    for name in ('Open', 'High', 'Low', 'Close', 'Volume') :
+        assert np.array_equal(getattr(candles, name.lower() + 's'), bars[name].to_numpy())
+    assert candles.indices.tolist() == list(range(len(candles)))
+
+
+def test_resample_matches_pandas() :
+    pd = pytest.importorskip('pandas')
+    candles = random_candles()
+    pdf = candles.to_pandas()
+    agg = { 'Open' : 'first', 'High' : 'max', 'Low' : 'min', 'Close' : 'last', 'Volume' : 'sum' }
+
+    rules = {
+        '5min' : pdf.resample('5min'),
+        '1h'   : pdf.resample('1h'),
+        'D'    : pdf.resample('D'),
+        '3D'   : pdf.resample('72h', origin='epoch'),
+        'M'    : pdf.resample('MS'),
+        'W'    : pdf.groupby(pdf.index.to_period('W-SUN').start_time),
+    }
+    for rule, grouped in rules.items() :
+        bars = grouped.agg(agg).dropna(subset=['Open'])
+        assert_same_bars(candles.resample(rule), bars)
+
+    for rule in ( 1, 7, 5000 ) :
+        groups = np.arange(len(pdf)) // rule
+        bars = pdf.reset_index().groupby(groups).agg(dict(agg, Date='first')).set_index('Date')
+        assert_same_bars(candles.resample(rule), bars)
+
+
+def test_resample_by_integer_without_dates() :
+    candles = random_candles(n=20, dated=False)
+    resampled = candles.resample(6)
+
+    assert resampled.opens.tolist() == candles.opens[[0, 6, 12, 18]].tolist()
+    assert resampled.closes.tolist() == candles.closes[[5, 11, 17, 19]].tolist()
+    assert resampled.highs.tolist() == [ candles.highs[i:i+6].max() for i in range(0, 20, 6) ]
+    assert resampled.dates.tolist() == [None]*4
+    with pytest.raises(Exception) :
+        candles.resample('D')
+    with pytest.raises(Exception) :
+        candles.resample(2.5)
+
+
+def test_save_and_open_mmap_round_trip(tmp_path) :
+    dated = random_candles(n=500)
+    shuffled = dated[np.random.default_rng(1).permutation(len(dated))]
+    undated = random_candles(n=500, dated=False)
+    start, end = dated.dates[100], dated.dates[300]
+
+    for name, candles in { 'dated' : dated[20:400], 'shuffled' : shuffled, 'undated' : undated[20:400] }.items() :
+        candles.save(tmp_path / name)
+        opened = Candles.open_mmap(tmp_path / name)
+
+        assert len(opened) == len(candles)
+        for column in ('opens', 'highs', 'lows', 'closes', 'volumes', 'indices') :
+            assert np.array_equal(getattr(opened, column), getattr(candles, column))
+            assert isinstance(getattr(opened, column).base, np.memmap)
+        if name == 'undated' :
+            assert opened.dates.tolist() == [None]*len(candles)
+            with pytest.raises(Exception) :
+                opened.between(start, end)
+        else :
+            assert np.array_equal(opened.dates, candles.dates)
+            assert np.array_equal(opened.between(start, end).indices, candles.between(start, end).indices)
+            assert np.array_equal(opened.between(end_date=start).dates, candles.between(end_date=start).dates)
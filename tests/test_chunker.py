@@ -0,0 +1,82 @@
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoints
+from TechnicalTools.Chunker import UpperLowerChunker, StreamingUpperLowerChunker
+
+
+def per_point_chunk_down(upper, lower, upper_bws=None, lower_bws=None, upper_symbol='H', lower_symbol='L') :
+    """Chunks of the original per-point implementation, a Python sort with key function."""
+
+    def sortkey(dp, bw) :
+        if bw is None :
+            return dp.x
+        first = ( dp.symbol == upper_symbol and bw == 'white' ) or ( dp.symbol == lower_symbol and bw == 'black' )
+        return ( dp.x, 1 if first else 2 )
+
+    if upper_bws is None or lower_bws is None :
+        upper_bws, lower_bws = [None]*len(upper), [None]*len(lower)
+    tmp = list(zip(upper, upper_bws)) + list(zip(lower, lower_bws))
+    tmp.sort(key=lambda item : sortkey(*item))
+
+    chunks = []
+    for dp, _ in tmp :
+        if chunks and chunks[-1][0].symbol == dp.symbol :
+            chunks[-1].append(dp)
+        else :
+            chunks.append([dp])
+    return chunks
+
+
+def chunk_rows(chunks) :
+    return [ [ ( dp.x, dp.y, dp.index, dp.symbol ) for dp in chunk ] for chunk in chunks ]
+
+
+def random_inputs(n_inputs=100, seed=0) :
+    """Upper/lower datapoints with many ties in x, not sorted by x, and their black/white colors."""
+
+    rng = np.random.default_rng(seed)
+    for _ in range(n_inputs) :
+        n_upper, n_lower = int(rng.integers(0, 20)), int(rng.integers(0, 20))
+        span = int(rng.integers(1, 15))
+        upper_xs, lower_xs = rng.integers(0, span, n_upper), rng.integers(0, span, n_lower)
+        upper = DataPoints.create_from_xsys(upper_xs, rng.random(n_upper) + 1, indices=np.arange(n_upper), symbols=['H']*n_upper)
+        lower = DataPoints.create_from_xsys(lower_xs, rng.random(n_lower), indices=np.arange(n_lower), symbols=['L']*n_lower)
+        yield upper, lower, rng.choice(['black','white'], n_upper).tolist(), rng.choice(['black','white'], n_lower).tolist()
+
+
+def test_chunk_down_matches_per_point_with_ties() :
+    chunker = UpperLowerChunker('H', 'L')
+    for upper, lower, upper_bws, lower_bws in random_inputs() :
+        expected = per_point_chunk_down(list(upper), list(lower), upper_bws, lower_bws)
+        assert chunk_rows(chunker.chunk_down(upper, lower, upper_bws, lower_bws)) == chunk_rows(expected)
+
+        expected = per_point_chunk_down(list(upper), list(lower))
+        assert chunk_rows(chunker.chunk_down(upper, lower)) == chunk_rows(expected)
+
+
+def test_streaming_matches_chunk_down_on_random_interleavings() :
+    rng = np.random.default_rng(1)
+    chunker = UpperLowerChunker('H', 'L')
+    for upper, lower, upper_bws, lower_bws in random_inputs(seed=1) :
+        with_bws = bool(rng.integers(0, 2))
+        sides = rng.permutation([0]*len(upper) + [1]*len(lower))
+        upper_iter, lower_iter = iter(zip(upper, upper_bws)), iter(zip(lower, lower_bws))
+
+        streaming = StreamingUpperLowerChunker('H', 'L')
+        for side in sides :
+            before = chunk_rows(streaming.chunks)
+            if side == 0 :
+                dp, bw = next(upper_iter)
+                first = streaming.push_upper(dp, bw if with_bws else None)
+            else :
+                dp, bw = next(lower_iter)
+                first = streaming.push_lower(dp, bw if with_bws else None)
+            # chunks before the returned index are not modified.
+            assert chunk_rows(streaming.chunks)[:first] == before[:first]
+
+        if with_bws :
+            expected = chunker.chunk_down(upper, lower, upper_bws, lower_bws)
+        else :
+            expected = chunker.chunk_down(upper, lower)
+        assert chunk_rows(streaming.chunks) == chunk_rows(expected)
+        assert chunk_rows([ streaming.get_chunk(i) for i in range(len(streaming)) ]) == chunk_rows(expected)
@@ -0,0 +1,14 @@
+import pytest
+
+from TechnicalTools.DataOrganizer import DataPoint, Chunk, Chunks
+
+
+def test_append_copies_chunk_and_rejects_empty_chunk() :
+    chunks = Chunks([])
+    with pytest.raises(Exception) :
+        chunks.append(Chunk([], symbol='H'))
+
+    chunk = Chunk([DataPoint(0, 1., symbol='H')], symbol='H')
+    chunks.append(chunk)
+    chunk.append(DataPoint(1, 2., symbol='H'))
+    assert len(chunks) == 1 and len(chunks[0]) == 1
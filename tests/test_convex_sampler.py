@@ -0,0 +1,99 @@
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoints
+from TechnicalTools.DataSampler import ConvexSampler
+from TechnicalTools.DataSampler.utils.convexity import select_non_adjacent
+
+
+def per_point_non_adjacent(candidates, priorities) :
+    """Candidates visited one by one in descending order of priority (ties in order of position)."""
+
+    n = len(candidates)
+    deleted = [False]*n
+    for i in sorted([ i for i in range(n) if candidates[i] ], key=lambda i : -priorities[i]) :
+        if ( i > 0 and deleted[i-1] ) or ( i < n-1 and deleted[i+1] ) :
+            continue
+        deleted[i] = True
+    return np.array(deleted, dtype=bool)
+
+
+def per_point_sample(xs, ys, w, maxiter, is_target) :
+    """Remaining positions of the original per-point sampler, with numpy float division."""
+
+    n = len(xs)
+    left  = list(range(-1, n-1))
+    right = list(range(1, n+1))
+    deleted = [False]*n
+    xmin, xmax = xs[0], xs[-1]
+
+    def convexity(i) :
+        l, r = left[i], right[i]
+        dyl, dxl = ( ys[i] - ys[l], xs[i] - xs[l] ) if l >= 0 else ( 0, 2*( xs[i] - xmin ) + 1 )
+        dyr, dxr = ( ys[r] - ys[i], xs[r] - xs[i] ) if r < n else ( 0, 2*( xmax - xs[i] ) + 1 )
+        if dxl + dxr <= w :
+            return ( dyr/dxr - dyl/dxl ) / ( dxl + dxr )
+
+    with np.errstate(divide='ignore', invalid='ignore') :
+        for _ in range(maxiter) :
+            live = [ i for i in range(n) if not deleted[i] ]
+            candidates = []
+            for i in live :
+                c = convexity(i)
+                if c and is_target(c, xs[i], ys[i]) :
+                    candidates.append(( c, i ))
+            candidates.sort(key=lambda ci : abs(ci[0]), reverse=True)
+
+            cnt = 0
+            for _, i in candidates :
+                if ( left[i] >= 0 and deleted[left[i]] ) or ( right[i] < n and deleted[right[i]] ) :
+                    continue
+                deleted[i] = True
+                cnt += 1
+
+            live = [ i for i in live if not deleted[i] ]
+            for l, i, r in zip([-1] + live[:-1], live, live[1:] + [n]) :
+                left[i], right[i] = l, r
+            if cnt == 0 :
+                break
+
+    return [ i for i in range(n) if not deleted[i] ]
+
+
+def tied_series(n_series=60, seed=0) :
+    """Series of integer coordinates with tied |convexity| values, partly with duplicate x-values."""
+
+    rng = np.random.default_rng(seed)
+    for k in range(n_series) :
+        n = int(rng.integers(1, 80))
+        steps = rng.integers(0 if k % 2 else 1, 3, n)
+        xs = np.cumsum(steps).astype(np.float64)
+        ys = rng.integers(-2, 3, n).cumsum().astype(np.float64)
+        yield xs, ys, float(rng.choice([3, 4, 6, 10]))
+
+
+def large_convexity(convexities, xs, ys) :
+    return np.abs(convexities) > 0.2
+
+
+def test_select_non_adjacent_matches_per_point() :
+    rng = np.random.default_rng(0)
+    for _ in range(300) :
+        n = int(rng.integers(0, 40))
+        candidates = rng.random(n) < rng.choice([0.3, 0.7, 1.0])
+        priorities = rng.integers(0, 4, n).astype(np.float64)
+        expected = per_point_non_adjacent(candidates, priorities)
+        assert np.array_equal(select_non_adjacent(candidates, priorities), expected)
+
+
+def test_round_mode_matches_per_point_with_ties_and_duplicate_x() :
+    targets = {
+        'upward' : lambda c, x, y : c > 0,
+        'downward' : lambda c, x, y : c < 0,
+        'user_defined' : lambda c, x, y : abs(c) > 0.2,
+    }
+    for xs, ys, w in tied_series() :
+        data = DataPoints.create_from_xsys(xs, ys)
+        for target, is_target in targets.items() :
+            sampler = ConvexSampler(target, w=w, evaluator=large_convexity)
+            expected = per_point_sample(list(xs), list(ys), w, max(1,int(w)), is_target)
+            assert sampler.sample_indices(data).tolist() == expected
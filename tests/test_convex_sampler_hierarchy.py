@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from TechnicalTools.DataOrganizer import DataPoints
+from TechnicalTools.DataSampler import ConvexSampler
+
+
+def make_datapoints(n=300, seed=0) :
+    rng = np.random.default_rng(seed)
+    return DataPoints.create_from_xsys(np.arange(n), np.cumsum(rng.normal(0, 1, n)))
+
+
+def test_level_query_matches_maxiter() :
+    data = make_datapoints()
+    hierarchy = ConvexSampler('upward', w=10).create_hierarchy(data)
+    for level in range(hierarchy.max_level + 1) :
+        expected = ConvexSampler('upward', w=10, maxiter=level).sample(data)
+        assert np.array_equal(hierarchy.sample(level=level).xs, expected.xs)
+
+
+def test_n_points_query_rejects_less_than_survivors() :
+    hierarchy = ConvexSampler('upward', w=10).create_hierarchy(make_datapoints())
+    n_survivors = int(hierarchy.mask().sum())
+
+    assert hierarchy.mask(n_points=n_survivors + 5).sum() == n_survivors + 5
+    with pytest.raises(Exception) :
+        hierarchy.mask(n_points=n_survivors - 1)
+
+
+def test_greedy_hierarchy_rejects_level_query() :
+    hierarchy = ConvexSampler('upward', w=10, mode='greedy').create_hierarchy(make_datapoints())
+    assert hierarchy.mask(n_points=len(hierarchy)).all()
+    with pytest.raises(Exception) :
+        hierarchy.mask(level=1)
@@ -0,0 +1,69 @@
+import numpy as np
+
+from TechnicalTools.DataOrganizer import Candles
+from TechnicalTools.ZigZag import ThresholdZigZagDetector, LiveZigZag
+
+
+def rows(datapoints) :
+    return [ ( dp.x, dp.y, dp.index, dp.symbol ) for dp in datapoints ]
+
+
+def random_bars(n_series=60, seed=0) :
+    """Random walks of bars, partly rounded to make ties of highs/lows and reversal levels."""
+
+    rng = np.random.default_rng(seed)
+    for k in range(n_series) :
+        n = int(rng.integers(1, 1500))
+        closes = 100 + np.cumsum(rng.normal(0, 1, n))
+        if k % 3 == 0 :
+            closes = np.round(closes)
+        highs = closes + np.abs(rng.normal(0, 0.5, n))
+        lows  = closes - np.abs(rng.normal(0, 0.5, n))
+        if k % 5 == 0 :
+            highs, lows = np.round(highs), np.round(lows)
+        yield highs, lows, closes, float(rng.choice([0.005, 0.01, 0.03, 0.1])), float(rng.choice([0.5, 1, 2, 3]))
+
+
+def test_pushed_bars_match_detect_from_candles() :
+    for highs, lows, closes, ratio, multiple in random_bars() :
+        n = len(closes)
+        candles = Candles.create_from_arrays(closes, highs, lows, closes, indices=np.arange(n)*10)
+        for method, threshold in ( ( 'percent', ratio ), ( 'atr', multiple ) ) :
+            expected = ThresholdZigZagDetector(threshold, method).detect_from_candles(candles)
+
+            events = []
+            live = LiveZigZag(threshold, method, callback=lambda event, dp : events.append(event))
+            for i in range(n) :
+                live.push(highs[i], lows[i], closes[i], index=10*i)
+
+            assert rows(live.to_zigzag()) == rows(expected)
+            assert len(live) == len(expected)
+            assert rows(live.confirmed) == rows(expected)[:-1]
+            assert events.count('confirmed') == len(live.confirmed)
+            assert rows(live.upper_points) == rows(expected.upper_points)
+            assert rows(live.lower_points) == rows(expected.lower_points)
+
+
+def test_callback_events() :
+    bars = [ ( 100, 100 ), ( 105, 104 ), ( 112, 111 ), ( 115, 113 ), ( 110, 106 ), ( 104, 100 ), ( 101, 98 ), ( 108, 105 ) ]
+
+    fired = []
+    live = LiveZigZag(0.1, 'percent', callback=lambda event, dp : fired.append(( event, dp.x, dp.y, dp.index, dp.symbol )))
+    returned = []
+    for i, ( high, low ) in enumerate(bars) :
+        returned.append([ ( event, dp.x, dp.y, dp.index, dp.symbol ) for event, dp in live.push(high, low, index=10*i) ])
+
+    assert returned == [
+        [],
+        [],
+        [ ( 'confirmed', 0, 100, 0, 'L' ), ( 'moved', 2, 112, 20, 'H' ) ],
+        [ ( 'moved', 3, 115, 30, 'H' ) ],
+        [],
+        [ ( 'confirmed', 3, 115, 30, 'H' ), ( 'moved', 5, 100, 50, 'L' ) ],
+        [ ( 'moved', 6, 98, 60, 'L' ) ],
+        [ ( 'confirmed', 6, 98, 60, 'L' ), ( 'moved', 7, 108, 70, 'H' ) ],
+    ]
+    assert fired == sum(returned, [])
+    assert rows([ live.tentative ]) == [ ( 7, 108, 70, 'H' ) ]
+    assert rows(live.confirmed) == [ ( 0, 100, 0, 'L' ), ( 3, 115, 30, 'H' ), ( 6, 98, 60, 'L' ) ]
+    assert len(live) == 4
@@ -0,0 +1,68 @@
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoints
+from TechnicalTools.DataSampler import LocalMinMaxSampler, StreamingLocalMinMaxSampler
+
+
+def per_point_mask(xs, ys, d, method) :
+    """Local min/max of each datapoint with the neighbor predicate of the original per-point sampler."""
+
+    mask = []
+    for i in range(len(xs)) :
+        neighbors = [ ys[j] for j in range(len(xs))
+                      if not ( xs[i] - xs[j] > d if j < i else xs[j] - xs[i] > d ) ]
+        mask.append(ys[i] == ( min(neighbors) if method == 'min' else max(neighbors) ))
+    return np.array(mask)
+
+
+def float_series(n_series=100, seed=0) :
+    """Series with non-integer, partly repeated x-values, where x -/+ d and x-distances round differently."""
+
+    rng = np.random.default_rng(seed)
+    yield np.array([0.7, 1.0]), np.array([0., 1.]), 0.3
+    for _ in range(n_series) :
+        n = int(rng.integers(2, 60))
+        step = float(rng.choice([0.01, 0.1, 0.3, 0.7]))
+        xs = np.round(np.cumsum(rng.integers(0, 4, n)*step) + float(rng.choice([0., 0.7, 1e6])), 2)
+        ys = np.round(rng.normal(0, 1, n), 1)
+        yield xs, ys, float(rng.choice([0.1, 0.2, 0.3, 0.7]))*int(rng.integers(1, 4))
+
+
+def test_sample_float_x_neighbors() :
+    data = DataPoints.create_from_xsys([0.7, 1.0], [0., 1.])
+    # 1.0 - 0.7 > 0.3 in floating point, so the datapoints are not neighbors.
+    assert LocalMinMaxSampler('min', d=0.3).sample(data).xs.tolist() == [0.7, 1.0]
+
+
+def test_sample_matches_per_point_on_float_x() :
+    for xs, ys, d in float_series() :
+        data = DataPoints.create_from_xsys(xs, ys)
+        for method in ('min', 'max') :
+            sampler = LocalMinMaxSampler(method, d=d)
+            expected = per_point_mask(xs.tolist(), ys.tolist(), d, method)
+            assert np.array_equal(sampler.sample_mask(data), expected)
+
+            chunked = [ dps.xs for dps in sampler.sample_chunked(ys, xs=xs, block_size=7) ]
+            assert np.array_equal(np.concatenate(chunked) if chunked else [], xs[expected])
+
+
+def test_sample_with_index_matches_sample_on_float_x() :
+    for xs, ys, d in float_series(seed=1) :
+        data = DataPoints.create_from_xsys(xs, ys)
+        for method in ('min', 'max') :
+            sampler = LocalMinMaxSampler(method, d=d)
+            index = sampler.create_index(data)
+            assert np.array_equal(sampler.sample_mask(data, index=index), sampler.sample_mask(data))
+            assert index.count(d) == sampler.sample_mask(data).sum()
+
+
+def test_streaming_matches_sample_on_float_x() :
+    for xs, ys, d in float_series(seed=2) :
+        data = DataPoints.create_from_xsys(xs, ys)
+        for method in ('min', 'max') :
+            streaming = StreamingLocalMinMaxSampler(method, d=d)
+            confirmed = []
+            for x, y in zip(xs, ys) :
+                confirmed += streaming.push(x, y)
+            confirmed += streaming.flush()
+            assert [ dp.x for dp in confirmed ] == LocalMinMaxSampler(method, d=d).sample(data).xs.tolist()
@@ -0,0 +1,39 @@
+import numpy as np
+
+from TechnicalTools.DataOrganizer import Candles, StreamingCandles, DataPoints
+
+
+def test_views_keep_bars_after_appends() :
+    stream = StreamingCandles(capacity=4)
+    for i in range(6) :
+        stream.append(i, i+1, i-1, i)
+
+    highs = DataPoints.create_from_candles(stream, 'H')
+    window = stream[1:3]
+    for i in range(6, 20) :
+        stream.append(i, i+1, i-1, i)
+
+    assert highs.ys.tolist() == [3., 4., 5., 6.]
+    assert highs.indices.tolist() == [2, 3, 4, 5]
+    assert window.indices.tolist() == [3, 4]
+    assert stream.indices.tolist() == [16, 17, 18, 19]
+
+
+def test_inherited_constructors_return_appendable_stream(tmp_path) :
+    values = np.arange(5.)
+    candles = Candles.create_from_arrays(values, values + 1, values - 1, values)
+    candles.save(tmp_path / 'candles')
+
+    pdf = candles.to_pandas()
+    timestamps = np.array(['2024-01-01T00:00:00', '2024-01-01T00:00:30', '2024-01-01T00:01:10'], dtype='datetime64[ns]')
+
+    for stream in ( StreamingCandles.create_from_arrays(values, values + 1, values - 1, values),
+                    StreamingCandles.create_from_pandas(pdf),
+                    StreamingCandles.open_mmap(tmp_path / 'candles'),
+                    StreamingCandles.create_from_ticks(timestamps, np.array([1., 2., 3.])) ) :
+        n = len(stream)
+        stream.append(9., 10., 8., 9.)
+        assert isinstance(stream, StreamingCandles)
+        assert stream.closes[-1] == 9. and stream.indices[-1] == n
+
+    assert values.tolist() == [0., 1., 2., 3., 4.]
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from TechnicalTools.DataOrganizer import Candles, TickBarAggregator
+
+
+BARS = [ ( 'time', '1min' ), ( 'time', '15s' ), ( 'tick', 7 ), ( 'volume', 10. ), ( 'volume', 2.5 ) ]
+
+
+def random_ticks(n=500, seed=0) :
+    """Ticks with repeated timestamps, gaps longer than a bar, and fractional sizes."""
+
+    rng = np.random.default_rng(seed)
+    steps = rng.choice([0, 0, 1, 3, 20, 200], n)*np.int64(10**9)
+    timestamps = np.datetime64('2024-01-01T09:00:00', 'ns') + np.cumsum(steps)
+    prices = 100 + np.round(np.cumsum(rng.normal(0, 0.1, n)), 2)
+    sizes = np.round(rng.random(n)*3, 1)
+    return timestamps, prices, sizes
+
+
+def columns(candles) :
+    return { name : getattr(candles, name).tolist() for name in ('dates', 'opens', 'highs', 'lows', 'closes', 'volumes') }
+
+
+def test_batch_splits_give_same_bars() :
+    timestamps, prices, sizes = random_ticks()
+    rng = np.random.default_rng(1)
+    for bar, bar_size in BARS :
+        expected = columns(Candles.create_from_ticks(timestamps, prices, sizes, bar=bar, bar_size=bar_size))
+        for _ in range(20) :
+            splits = np.sort(rng.integers(0, len(prices), int(rng.integers(0, 30))))
+            aggregator = TickBarAggregator(bar=bar, bar_size=bar_size)
+            for start, stop in zip(np.r_[0, splits], np.r_[splits, len(prices)]) :
+                aggregator.push(timestamps[start:stop], prices[start:stop], sizes[start:stop])
+            aggregator.flush()
+            assert columns(aggregator.candles) == expected
+
+
+def test_create_from_ticks_matches_pandas() :
+    pd = pytest.importorskip('pandas')
+    timestamps, prices, sizes = random_ticks(seed=2)
+    ticks = pd.DataFrame({ 'price' : prices, 'size' : sizes }, index=pd.DatetimeIndex(timestamps))
+
+    def ohlcv(grouped) :
+        bars = grouped.agg(Open=('price','first'), High=('price','max'), Low=('price','min'),
+                           Close=('price','last'), Volume=('size','sum'), count=('price','size'))
+        return bars[bars['count'] > 0]
+
+    def assert_bars(candles, bars, dates) :
+        assert np.array_equal(candles.dates, np.asarray(dates, dtype=candles.dates.dtype))
+        for name in ('Open', 'High', 'Low', 'Close', 'Volume') :
+            assert np.allclose(getattr(candles, name.lower() + 's'), bars[name].to_numpy(), rtol=0, atol=1e-9)
+
+    bars = ohlcv(ticks.resample('1min'))
+    assert_bars(Candles.create_from_ticks(timestamps, prices, sizes, bar='time', bar_size='1min'),
+                bars, bars.index.to_numpy())
+
+    groups = np.arange(len(prices)) // 7
+    bars = ohlcv(ticks.groupby(groups))
+    assert_bars(Candles.create_from_ticks(timestamps, prices, sizes, bar='tick', bar_size=7),
+                bars, timestamps[np.flatnonzero(np.diff(groups, prepend=-1))])
+
+    groups = np.floor(( ticks['size'].cumsum() - ticks['size'] ).to_numpy() / 10.)
+    bars = ohlcv(ticks.groupby(groups))
+    assert_bars(Candles.create_from_ticks(timestamps, prices, sizes, bar='volume', bar_size=10.),
+                bars, timestamps[np.flatnonzero(np.diff(groups, prepend=-1))])
@@ -0,0 +1,32 @@
+import numpy as np
+
+from TechnicalTools.DataOrganizer import DataPoints, Chunks
+from TechnicalTools.ZigZag import ZigZagDetector
+
+
+def rows(datapoints) :
+    return [ ( dp.x, dp.y, dp.index, dp.symbol ) for dp in datapoints ]
+
+
+def random_chunks(n_chunks=100, seed=0) :
+    """Chunks of integer y-values with many ties, including chunks of a third symbol."""
+
+    rng = np.random.default_rng(seed)
+    for _ in range(n_chunks) :
+        n = int(rng.integers(0, 40))
+        symbols = np.array(['H','L','M'])[rng.choice(3, n, p=[0.45, 0.45, 0.1])]
+        ys = rng.integers(0, 3, n).astype(np.float64)
+        yield Chunks.create_from_datapoints(DataPoints.create_from_xsys(np.arange(n), ys, indices=np.arange(n)*10, symbols=symbols.tolist()))
+
+
+def test_vectorized_selection_matches_per_chunk_select_functions() :
+    detector = ZigZagDetector('H', 'L')
+    per_chunk = ZigZagDetector('H', 'L',
+                               upper_select_func=lambda chunk : max(chunk, key=lambda dp : dp.y),
+                               lower_select_func=lambda chunk : min(chunk, key=lambda dp : dp.y))
+    for chunks in random_chunks() :
+        expected = rows(per_chunk.detect_from_chunks(chunks))
+        # the first datapoint of tied max/min y-values is selected, as 'max'/'min' does.
+        assert rows(detector.detect_from_chunks(chunks)) == expected
+        assert rows(chunks.to_datapoints()[detector.detect_indices_from_chunks(chunks)]) == expected
+        assert rows(detector.detect_from_chunks(list(chunks))) == expected